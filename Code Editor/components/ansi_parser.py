@@ -0,0 +1,165 @@
+import re
+
+# CSI sequences, OSC strings (window titles, hyperlinks) and the short two-byte escapes
+SEQUENCE = re.compile(r"\x1b(?:\[([0-9;:?<=>]*)[ -/]*([@-~])|\][^\x07\x1b]*(?:\x07|\x1b\\)|[ -/]*[0-Z\\^-~])")
+PARTIAL = re.compile(r"\x1b(?:\[[0-9;:?<=>]*[ -/]*|\][^\x07\x1b]*\x1b?|[ -/]*)?")
+MAX_PENDING = 4096
+
+BASIC_COLORS = [
+    "#000000", "#cd3131", "#0dbc79", "#e5e510", "#2472c8", "#bc3fbc", "#11a8cd", "#e5e5e5",
+    "#666666", "#f14c4c", "#23d18b", "#f5f543", "#3b8eea", "#d670d6", "#29b8db", "#ffffff",
+]
+
+
+def palette_color(index):
+    if index < 16:
+        return BASIC_COLORS[index]
+    if index < 232:
+        index -= 16
+        levels = [0 if value == 0 else 55 + value * 40 for value in (index // 36, index // 6 % 6, index % 6)]
+        return "#%02x%02x%02x" % tuple(levels)
+    gray = 8 + (index - 232) * 10
+    return "#%02x%02x%02x" % (gray, gray, gray)
+
+
+PLAIN = (None, None, False, False, False, False, False, False)
+
+
+def extended_color(values):
+    # What follows a 38 or 48: 5 and a palette index, or 2 and red, green, blue
+    if values and values[0] == 5 and len(values) > 1:
+        return palette_color(min(values[1], 255)), 2
+    if values and values[0] == 2 and len(values) > 3:
+        return "#%02x%02x%02x" % tuple(min(value, 255) for value in values[1:4]), 4
+    return None, 1
+
+
+def apply_sgr(key, parameters):
+    fg, bg, bold, dim, italic, underline, inverse, strike = key or PLAIN
+    groups = [group.split(":") for group in parameters.split(";")]
+    codes = [int(fields[0]) if fields[0].isdigit() else 0 for fields in groups]
+    index = 0
+    while index < len(codes):
+        code = codes[index]
+        fields = groups[index]
+        index += 1
+        if len(fields) > 1:
+            # Colon sub-parameters all belong to this one code, as in 38:2::R:G:B or 4:3
+            values = [int(value) if value.isdigit() else 0 for value in fields[1:]]
+            if code in (38, 48):
+                # The full form has a colour space id before red, green and blue
+                if values[0] == 2 and len(values) > 4:
+                    del values[1]
+                if code == 38:
+                    fg = extended_color(values)[0]
+                else:
+                    bg = extended_color(values)[0]
+            elif code == 4:
+                underline = values[0] != 0
+            continue
+        if code == 0:
+            fg, bg, bold, dim, italic, underline, inverse, strike = PLAIN
+        elif code == 1:
+            bold = True
+        elif code == 2:
+            dim = True
+        elif code == 3:
+            italic = True
+        elif code == 4:
+            underline = True
+        elif code == 7:
+            inverse = True
+        elif code == 9:
+            strike = True
+        elif code == 22:
+            bold = dim = False
+        elif code == 23:
+            italic = False
+        elif code == 24:
+            underline = False
+        elif code == 27:
+            inverse = False
+        elif code == 29:
+            strike = False
+        elif 30 <= code <= 37:
+            fg = BASIC_COLORS[code - 30]
+        elif 90 <= code <= 97:
+            fg = BASIC_COLORS[code - 82]
+        elif code == 39:
+            fg = None
+        elif 40 <= code <= 47:
+            bg = BASIC_COLORS[code - 40]
+        elif 100 <= code <= 107:
+            bg = BASIC_COLORS[code - 92]
+        elif code == 49:
+            bg = None
+        elif code in (38, 48) and index < len(codes):
+            color, used = extended_color(codes[index:index + 4])
+            index += used
+            if code == 38:
+                fg = color
+            else:
+                bg = color
+
+    key = (fg, bg, bold, dim, italic, underline, inverse, strike)
+    # None means no attributes, so callers can use the plain channel format
+    return None if key == PLAIN else key
+
+
+class AnsiParser:
+    def __init__(self):
+        self.transitions = {}
+        self.clear()
+
+    def clear(self):
+        self.pending = ""
+        self.key = None
+
+    def feed(self, text):
+        if self.pending:
+            text = self.pending + text
+            self.pending = ""
+        if "\x1b" not in text:
+            return [(self.key, text)] if text else []
+
+        # split() leaves text, parameters, final byte, text, ... which is much cheaper than match objects
+        pieces = SEQUENCE.split(text)
+        rest = pieces.pop()
+        # An escape cut off at the end of a chunk is finished by the next one
+        escape = rest.rfind("\x1b")
+        if escape >= 0 and len(rest) - escape < MAX_PENDING and PARTIAL.fullmatch(rest, escape):
+            self.pending = rest[escape:]
+            rest = rest[:escape]
+
+        runs = []
+        parts = []
+        key = self.key
+        transitions = self.transitions
+        for index in range(0, len(pieces), 3):
+            if pieces[index]:
+                parts.append(pieces[index])
+            if pieces[index + 2] != "m":
+                continue
+            parameters = pieces[index + 1]
+            # Output reuses a handful of colour changes, so each one is worked out once
+            new_key = transitions.get((key, parameters), False)
+            if new_key is False:
+                new_key = key if "?" in parameters else apply_sgr(key, parameters)
+                if len(transitions) < 4096:
+                    transitions[(key, parameters)] = new_key
+            if new_key != key:
+                self._add_run(runs, key, parts)
+                parts = []
+                key = new_key
+        if rest:
+            parts.append(rest)
+        self._add_run(runs, key, parts)
+        self.key = key
+        return runs
+
+    def _add_run(self, runs, key, parts):
+        text = "".join(parts)
+        if "\x1b" in text:
+            text = text.replace("\x1b", "")
+        if text:
+            runs.append((key, text))
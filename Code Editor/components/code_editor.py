@@ -1,15 +1,42 @@
+import re
 import sys
-from PyQt6.QtCore import Qt
+import bisect
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QColor
 from PyQt6.QtWidgets import QApplication
-from PyQt6.Qsci import QsciScintilla, QsciLexerPython, QsciAPIs
+from PyQt6.Qsci import QsciScintilla, QsciLexerPython, QsciAPIs, QsciStyle, QsciCommand
 from components.python_highlighter import PythonHighlighter
 
+# Files above either threshold open in large-file mode
+LARGE_FILE_BYTES = 8 * 1024 * 1024
+LARGE_FILE_LINES = 200000
+LARGE_FILE_CHUNK_BYTES = 256 * 1024
+
+OCCURRENCE_INDICATOR = 1
+OCCURRENCE_DELAY_MS = 150
+OCCURRENCE_MARGIN_LINES = 50
+MAX_OCCURRENCES = 2000
+
+# "# %%" starts a cell, the same marker Jupyter/VS Code use in plain .py files
+CELL_PATTERN = re.compile(r"^[ \t]*#[ \t]*%%", re.M)
+CELL_MARKER = 8
+CELL_DELAY_MS = 300
+SHIFT_RETURN = Qt.Key.Key_Return.value | Qt.KeyboardModifier.ShiftModifier.value
+
+HEATMAP_MARGIN = 3
+HEATMAP_MARKER_BASE = 10
+HEATMAP_COLORS = ["#1E3A5F", "#2B5F75", "#3C8D6E", "#7BA34D", "#C9A227", "#D9822B", "#D9542B", "#E02424"]
+
 class CodeEditor(QsciScintilla):
-    def __init__(self, parent=None, language="Python"):
+    def __init__(self, parent=None, language="Python", large_file=False):
         super().__init__(parent)
         self.file_path = None
         self.language = language
+        self.large_file = large_file
+        self.disabled_features = []
+        self.first_paint_ms = None
+        self.load_job = None
+        self.search_engine = None
         self.setup_editor()
 
     def setup_editor(self):
@@ -123,6 +150,30 @@ class CodeEditor(QsciScintilla):
 
         self.SendScintilla(QsciScintilla.SCI_INDICSETALPHA, 1, 100)
         self.SendScintilla(QsciScintilla.SCI_INDICSETOUTLINEALPHA, 1, 200)
+        self.setIndicatorForegroundColor(QColor("#5A6374"), OCCURRENCE_INDICATOR)
+
+        self._occurrence_pattern = None
+        self._occurrence_lines = None
+        self._occurrence_timer = QTimer(self)
+        self._occurrence_timer.setSingleShot(True)
+        self._occurrence_timer.timeout.connect(self.update_occurrences)
+        self.cursorPositionChanged.connect(lambda line, index: self._occurrence_timer.start(OCCURRENCE_DELAY_MS))
+        self.selectionChanged.connect(lambda: self._occurrence_timer.start(OCCURRENCE_DELAY_MS))
+        self.verticalScrollBar().valueChanged.connect(lambda value: self.extend_occurrences())
+
+        self.setMarginType(HEATMAP_MARGIN, QsciScintilla.MarginType.SymbolMargin)
+        self.setMarginWidth(HEATMAP_MARGIN, 0)
+        self.setMarginMarkerMask(HEATMAP_MARGIN, ((1 << len(HEATMAP_COLORS)) - 1) << HEATMAP_MARKER_BASE)
+        for level, color in enumerate(HEATMAP_COLORS):
+            self.markerDefine(QsciScintilla.MarkerSymbol.FullRectangle, HEATMAP_MARKER_BASE + level)
+            self.setMarkerBackgroundColor(QColor(color), HEATMAP_MARKER_BASE + level)
+
+        self.markerDefine(QsciScintilla.MarkerSymbol.Underline, CELL_MARKER)
+        self.setMarkerBackgroundColor(QColor("#3C5A78"), CELL_MARKER)
+        self._cell_timer = QTimer(self)
+        self._cell_timer.setSingleShot(True)
+        self._cell_timer.timeout.connect(self.update_cell_markers)
+        self.textChanged.connect(lambda: self._cell_timer.start(CELL_DELAY_MS))
 
         # Add keyboard shortcuts or command bindings
         self.SendScintilla(QsciScintilla.SCI_ASSIGNCMDKEY, 
@@ -135,6 +186,7 @@ class CodeEditor(QsciScintilla):
 
         self.SendScintilla(QsciScintilla.SCI_ANNOTATIONSETSTYLE, 0, 10)
         self.SendScintilla(QsciScintilla.SCI_ANNOTATIONSETVISIBLE, QsciScintilla.ANNOTATION_BOXED)
+        self.annotation_style = QsciStyle(-1, "Annotation", QColor("#D7BA7D"), QColor("#2A2D2E"), QFont("Consolas", 9))
         
 
         self.SendScintilla(QsciScintilla.SCI_SETRECTANGULARSELECTIONMODIFIER, 
@@ -142,12 +194,28 @@ class CodeEditor(QsciScintilla):
 
         self.installEventFilter(self)
         self.SendScintilla(QsciScintilla.SCI_SETCARETPERIOD)
-        self.highlighter = PythonHighlighter(self)
+        self.update_cell_keys()
+        if self.large_file:
+            self.highlighter = None
+            self.enable_large_file_mode()
+        else:
+            self.highlighter = PythonHighlighter(self, self.language)
+
+    def update_cell_keys(self):
+        # QScintilla binds Shift+Return to a newline, which swallows the run-cell shortcut in Python files
+        newline = self.standardCommands().find(QsciCommand.Command.Newline)
+        newline.setAlternateKey(0 if self.language == "Python" else SHIFT_RETURN)
 
     def set_language(self, language):
         self.language = language
+        self.update_cell_keys()
+        if self.large_file:
+            return
         
-        self.highlighter = PythonHighlighter(self)
+        previous = self.highlighter
+        self.highlighter = PythonHighlighter(self, language)
+        if previous:
+            previous.release()
         
         self.setMatchedBraceBackgroundColor(QColor("#3A3D41"))
         self.setMatchedBraceForegroundColor(QColor("#FF8000")) 
@@ -191,6 +259,169 @@ class CodeEditor(QsciScintilla):
         self.setEdgeColor(QColor("#404040"))
 
 
+    def release_highlighter(self):
+        if self.highlighter:
+            self.highlighter.release()
+            self.highlighter = None
+
+    def enable_large_file_mode(self):
+        self.large_file = True
+
+        self.setWrapMode(QsciScintilla.WrapMode.WrapNone)
+        self.setFolding(QsciScintilla.FoldStyle.NoFoldStyle, 2)
+        self.setMarginWidth(2, 0)
+        self.setBraceMatching(QsciScintilla.BraceMatch.NoBraceMatch)
+        self.setAutoCompletionSource(QsciScintilla.AutoCompletionSource.AcsNone)
+        self.setIndentationGuides(False)
+        self.SendScintilla(QsciScintilla.SCI_SETSCROLLWIDTHTRACKING, 0)
+
+        # Undo history for the initial load would double the memory footprint
+        self.SendScintilla(QsciScintilla.SCI_SETUNDOCOLLECTION, 0)
+
+        self.disabled_features = ["wrap", "folding", "highlighting", "brace matching", "autocomplete"]
+        return self.disabled_features
+
+    def append_chunk(self, data):
+        self.SendScintilla(QsciScintilla.SCI_APPENDTEXT, len(data), data)
+
+    def finish_large_file_load(self):
+        self.SendScintilla(QsciScintilla.SCI_SETUNDOCOLLECTION, 1)
+        self.SendScintilla(QsciScintilla.SCI_EMPTYUNDOBUFFER)
+        self.setMarginWidth(0, "0" * (len(str(self.lines())) + 1))
+        self.setModified(False)
+
+    def _occurrence_target(self):
+        if self.hasSelectedText():
+            line_from, index_from, line_to, index_to = self.getSelection()
+            selected = self.selectedText()
+            if line_from != line_to or not selected.strip() or len(selected) > 200:
+                return None
+            return re.compile(re.escape(selected.encode('utf-8')))
+
+        position = self.SendScintilla(QsciScintilla.SCI_GETCURRENTPOS)
+        start = self.SendScintilla(QsciScintilla.SCI_WORDSTARTPOSITION, position, True)
+        end = self.SendScintilla(QsciScintilla.SCI_WORDENDPOSITION, position, True)
+        if start == end or end - start > 200:
+            return None
+        word = self._byte_range(start, end)
+        return re.compile(rb"(?<!\w)" + re.escape(word) + rb"(?!\w)")
+
+    def _byte_range(self, start, end):
+        # QsciScintilla.bytes() includes the terminating NUL
+        return bytes(self.bytes(start, end))[:end - start]
+
+    def _visible_lines(self):
+        first = self.SendScintilla(QsciScintilla.SCI_GETFIRSTVISIBLELINE)
+        count = self.SendScintilla(QsciScintilla.SCI_LINESONSCREEN)
+        top = self.SendScintilla(QsciScintilla.SCI_DOCLINEFROMVISIBLE, first)
+        bottom = self.SendScintilla(QsciScintilla.SCI_DOCLINEFROMVISIBLE, first + count)
+        return (max(0, top - OCCURRENCE_MARGIN_LINES),
+                min(self.lines(), bottom + 1 + OCCURRENCE_MARGIN_LINES))
+
+    def clear_occurrences(self):
+        self.SendScintilla(QsciScintilla.SCI_SETINDICATORCURRENT, OCCURRENCE_INDICATOR)
+        self.SendScintilla(QsciScintilla.SCI_INDICATORCLEARRANGE, 0, self.length())
+        self._occurrence_lines = None
+
+    def update_occurrences(self):
+        self.clear_occurrences()
+        self._occurrence_pattern = self._occurrence_target()
+        if self._occurrence_pattern is None:
+            return
+        top, bottom = self._visible_lines()
+        self._fill_occurrences(top, bottom)
+        self._occurrence_lines = (top, bottom)
+
+    def extend_occurrences(self):
+        # Scrolling only searches the lines that were not covered yet
+        if self._occurrence_pattern is None or self._occurrence_lines is None:
+            return
+        top, bottom = self._visible_lines()
+        covered_top, covered_bottom = self._occurrence_lines
+        if bottom <= covered_top or top >= covered_bottom or covered_bottom - covered_top > 4 * (bottom - top):
+            self.update_occurrences()
+            return
+        if top < covered_top:
+            self._fill_occurrences(top, covered_top)
+        if bottom > covered_bottom:
+            self._fill_occurrences(covered_bottom, bottom)
+        self._occurrence_lines = (min(top, covered_top), max(bottom, covered_bottom))
+
+    def _fill_occurrences(self, top, bottom):
+        start = self.SendScintilla(QsciScintilla.SCI_POSITIONFROMLINE, top)
+        end = self.SendScintilla(QsciScintilla.SCI_GETLINEENDPOSITION, max(top, bottom - 1))
+        if end <= start:
+            return
+        text = self._byte_range(start, end)
+        self.SendScintilla(QsciScintilla.SCI_SETINDICATORCURRENT, OCCURRENCE_INDICATOR)
+        for count, match in enumerate(self._occurrence_pattern.finditer(text)):
+            if count >= MAX_OCCURRENCES:
+                break
+            self.SendScintilla(QsciScintilla.SCI_INDICATORFILLRANGE, start + match.start(), match.end() - match.start())
+
+    def cell_starts(self):
+        if self.large_file:
+            return [0]
+        text = self.text()
+        starts = [0]
+        line = 0
+        position = 0
+        for match in CELL_PATTERN.finditer(text):
+            line += text.count("\n", position, match.start())
+            position = match.start()
+            if line:
+                starts.append(line)
+        return starts
+
+    def cell_at(self, line):
+        starts = self.cell_starts()
+        index = bisect.bisect_right(starts, line) - 1
+        end = starts[index + 1] - 1 if index + 1 < len(starts) else self.lines() - 1
+        return starts[index], end
+
+    def lines_text(self, first, last):
+        start = self.SendScintilla(QsciScintilla.SCI_POSITIONFROMLINE, first)
+        end = self.SendScintilla(QsciScintilla.SCI_GETLINEENDPOSITION, last)
+        if end <= start:
+            return ""
+        return self._byte_range(start, end).decode('utf-8', errors='replace')
+
+    def update_cell_markers(self):
+        # Underline the line above each cell so cells read as separate blocks
+        self.markerDeleteAll(CELL_MARKER)
+        for line in self.cell_starts():
+            if line > 0:
+                self.markerAdd(line - 1, CELL_MARKER)
+
+    def show_annotations(self, notes):
+        self.clearAnnotations()
+        merged = {}
+        for line, text in notes:
+            if 0 <= line < self.lines():
+                merged.setdefault(line, []).append(text)
+        for line, texts in merged.items():
+            self.annotate(line, "\n".join(texts), self.annotation_style)
+
+    def marked_lines(self, marker=0):
+        lines = []
+        line = self.markerFindNext(0, 1 << marker)
+        while line != -1:
+            lines.append(line)
+            line = self.markerFindNext(line + 1, 1 << marker)
+        return lines
+
+    def show_heatmap(self, levels):
+        self.clear_heatmap()
+        for line, level in levels.items():
+            if 0 <= line < self.lines():
+                self.markerAdd(line, HEATMAP_MARKER_BASE + min(level, len(HEATMAP_COLORS) - 1))
+        self.setMarginWidth(HEATMAP_MARGIN, 6 if levels else 0)
+
+    def clear_heatmap(self):
+        for level in range(len(HEATMAP_COLORS)):
+            self.markerDeleteAll(HEATMAP_MARKER_BASE + level)
+        self.setMarginWidth(HEATMAP_MARGIN, 0)
+
     def _margin_clicked(self, margin, line, modifiers):
         if margin == 1:
             if self.markersAtLine(line) & (1 << 0):
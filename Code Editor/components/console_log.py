@@ -0,0 +1,100 @@
+import os
+import time
+from array import array
+from components.paths import cache_dir
+
+# Every INDEX_STRIDE-th line start is recorded, so the index stays tiny for huge logs
+INDEX_STRIDE = 256
+MAX_LOGS = 20
+
+
+class ConsoleLog:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.size = 0
+        self.line_count = 0
+        self.partial = False
+        self.offsets = array('q', [0])
+
+    @classmethod
+    def for_run(cls, name="run"):
+        directory = cache_dir("logs")
+        logs = sorted((entry for entry in os.scandir(directory) if entry.name.endswith(".log")),
+                      key=lambda entry: entry.stat().st_mtime)
+        for entry in logs[:max(0, len(logs) - MAX_LOGS + 1)]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return cls(os.path.join(directory, f"{name}-{stamp}-{os.getpid()}.log"))
+
+    def write(self, text):
+        data = text.encode('utf-8', errors='replace')
+        if not data:
+            return
+        newlines = data.count(b"\n")
+        first_line = self.line_count
+        if newlines and (first_line + newlines) // INDEX_STRIDE != first_line // INDEX_STRIDE:
+            position = -1
+            for line in range(first_line + 1, first_line + newlines + 1):
+                position = data.index(b"\n", position + 1)
+                if line % INDEX_STRIDE == 0:
+                    self.offsets.append(self.size + position + 1)
+        self.file.write(data)
+        self.size += len(data)
+        self.line_count += newlines
+        self.partial = not data.endswith(b"\n")
+
+    def total_lines(self):
+        return self.line_count + (1 if self.partial else 0)
+
+    def _seek_line(self, handle, line):
+        block = min(line // INDEX_STRIDE, len(self.offsets) - 1)
+        handle.seek(self.offsets[block])
+        for _ in range(line - block * INDEX_STRIDE):
+            if not handle.readline():
+                break
+
+    def read_lines(self, first, count):
+        self.flush()
+        lines = []
+        with open(self.path, "rb") as handle:
+            self._seek_line(handle, max(0, first))
+            for _ in range(count):
+                line = handle.readline()
+                if not line:
+                    break
+                lines.append(line.decode('utf-8', errors='replace').rstrip("\r\n"))
+        return lines
+
+    def flush(self):
+        self.file.flush()
+
+    def find(self, query, start_line, forward=True, cancelled=lambda: False):
+        needle = query.lower()
+        found = -1
+        with open(self.path, "rb") as handle:
+            if forward:
+                self._seek_line(handle, start_line)
+                line_number = start_line
+                for line in handle:
+                    if needle in line.decode('utf-8', errors='replace').lower():
+                        return line_number
+                    line_number += 1
+                    if line_number % 65536 == 0 and cancelled():
+                        return -1
+            else:
+                for line_number, line in enumerate(handle):
+                    if line_number >= start_line:
+                        break
+                    if needle in line.decode('utf-8', errors='replace').lower():
+                        found = line_number
+                    if line_number % 65536 == 0 and cancelled():
+                        return -1
+        return found
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
@@ -0,0 +1,239 @@
+import threading
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtGui import QTextCursor, QTextCharFormat, QColor, QFont
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QLineEdit, QPushButton, QLabel
+from components.console_log import ConsoleLog
+from components.ansi_parser import AnsiParser
+
+DEFAULT_MAX_LINES = 10000
+PAGE_LINES = 2000
+CONSOLE_FOREGROUND = "#d4d4d4"
+CONSOLE_BACKGROUND = "#1e1e1e"
+
+
+class ConsoleView(QWidget):
+    searchFinished = pyqtSignal(int, int)
+
+    def __init__(self, max_lines=DEFAULT_MAX_LINES, parent=None):
+        super().__init__(parent)
+        self.log = None
+        self.history_first = None
+        self._search_generation = 0
+        self.formats = {"stdout": QTextCharFormat()}
+        self.formats["stderr"] = QTextCharFormat()
+        self.formats["stderr"].setForeground(QColor("#F48771"))
+        self.formats["notice"] = QTextCharFormat()
+        self.formats["notice"].setForeground(QColor("#6b6b6b"))
+        self.formats["notice"].setFontItalic(True)
+        # Escape codes only matter in program output, notices are written by the IDE
+        self.parsers = {"stdout": AnsiParser(), "stderr": AnsiParser()}
+        self.ansi_formats = {}
+        self.setup_ui()
+        self.set_max_lines(max_lines)
+        self.searchFinished.connect(self.search_finished)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
+
+        header = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search output")
+        self.search_input.returnPressed.connect(lambda: self.search(True))
+        self.earlier_btn = QPushButton("Earlier")
+        self.later_btn = QPushButton("Later")
+        self.live_btn = QPushButton("Live")
+        self.earlier_btn.clicked.connect(self.show_earlier)
+        self.later_btn.clicked.connect(self.show_later)
+        self.live_btn.clicked.connect(self.show_live)
+        header.addWidget(self.search_input)
+        header.addWidget(self.earlier_btn)
+        header.addWidget(self.later_btn)
+        header.addWidget(self.live_btn)
+        layout.addLayout(header)
+
+        self.status = QLabel("")
+        self.status.setStyleSheet("color: #6b6b6b; font-size: 9pt;")
+        self.status.hide()
+        layout.addWidget(self.status)
+
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setUndoRedoEnabled(False)
+        self.view.setLineWrapMode(QPlainTextEdit.LineWrapMode.WidgetWidth)
+        layout.addWidget(self.view)
+
+        # Older output is paged in from the run log instead of living in the document
+        self.history = QPlainTextEdit()
+        self.history.setReadOnly(True)
+        self.history.setUndoRedoEnabled(False)
+        self.history.hide()
+        layout.addWidget(self.history)
+
+        self.update_buttons()
+
+    def format_for(self, channel, key):
+        if key is None:
+            return self.formats[channel]
+        text_format = self.ansi_formats.get((channel, key))
+        if text_format is None:
+            fg, bg, bold, dim, italic, underline, inverse, strike = key
+            text_format = QTextCharFormat(self.formats[channel])
+            if inverse:
+                fg, bg = bg or CONSOLE_BACKGROUND, fg or CONSOLE_FOREGROUND
+            if fg:
+                text_format.setForeground(QColor(fg))
+            elif dim:
+                text_format.setForeground(QColor("#808080"))
+            if bg:
+                text_format.setBackground(QColor(bg))
+            if bold:
+                text_format.setFontWeight(QFont.Weight.Bold)
+            text_format.setFontItalic(italic)
+            text_format.setFontUnderline(underline)
+            text_format.setFontStrikeOut(strike)
+            self.ansi_formats[(channel, key)] = text_format
+        return text_format
+
+    def set_max_lines(self, max_lines):
+        self.max_lines = max(100, max_lines)
+        self.view.setMaximumBlockCount(self.max_lines)
+
+    def start_log(self, name="run"):
+        self.close_log()
+        try:
+            self.log = ConsoleLog.for_run(name)
+        except OSError:
+            self.log = None
+
+    def close_log(self):
+        if self.log:
+            self.log.close()
+            self.log = None
+
+    def clear(self):
+        self._search_generation += 1
+        for parser in self.parsers.values():
+            parser.clear()
+        self.view.clear()
+        self.show_live()
+
+    def write(self, text, channel="stdout"):
+        self.write_segments([(channel, text)])
+
+    def write_segments(self, segments):
+        runs = []
+        for channel, text in segments:
+            parser = self.parsers.get(channel)
+            if parser is None:
+                runs.append((self.formats.get(channel, self.formats["stdout"]), text))
+                continue
+            for key, part in parser.feed(text):
+                runs.append((self.format_for(channel, key), part))
+
+        if self.log:
+            self.log.write("".join(text for _, text in runs))
+
+        scrollbar = self.view.verticalScrollBar()
+        following = scrollbar.value() >= scrollbar.maximum() - 4
+        cursor = QTextCursor(self.view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        for text_format, text in runs:
+            cursor.insertText(text, text_format)
+        cursor.endEditBlock()
+        if following:
+            scrollbar.setValue(scrollbar.maximum())
+        if self.history_first is None:
+            self.update_buttons()
+
+    def live_first_line(self):
+        if not self.log:
+            return 0
+        return max(0, self.log.total_lines() - self.view.blockCount())
+
+    def show_page(self, first, highlight=None):
+        if not self.log:
+            return
+        first = max(0, min(first, self.log.total_lines() - PAGE_LINES))
+        lines = self.log.read_lines(first, PAGE_LINES)
+        self.history_first = first
+        self.history.setPlainText("\n".join(lines))
+        if highlight is not None:
+            block = self.history.document().findBlockByNumber(highlight - first)
+            cursor = QTextCursor(block)
+            cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+            self.history.setTextCursor(cursor)
+            self.history.centerCursor()
+        self.view.hide()
+        self.history.show()
+        self.status.setText(f"Lines {first + 1}-{first + len(lines)} of {self.log.total_lines()} (from {self.log.path})")
+        self.status.show()
+        self.update_buttons()
+
+    def show_earlier(self):
+        if self.history_first is None:
+            self.show_page(self.live_first_line() - PAGE_LINES)
+        else:
+            self.show_page(self.history_first - PAGE_LINES)
+
+    def show_later(self):
+        if self.history_first is None:
+            return
+        first = self.history_first + PAGE_LINES
+        if first >= self.live_first_line():
+            self.show_live()
+        else:
+            self.show_page(first)
+
+    def show_live(self):
+        self.history_first = None
+        self.history.clear()
+        self.history.hide()
+        self.view.show()
+        self.status.hide()
+        self.update_buttons()
+
+    def update_buttons(self):
+        browsing = self.history_first is not None
+        self.earlier_btn.setEnabled(self.live_first_line() > 0 and (not browsing or self.history_first > 0))
+        self.later_btn.setEnabled(browsing)
+        self.live_btn.setEnabled(browsing)
+
+    def search(self, forward=True):
+        query = self.search_input.text()
+        if not query:
+            return
+        if not self.log:
+            if not self.view.find(query):
+                self.view.moveCursor(QTextCursor.MoveOperation.Start)
+                self.view.find(query)
+            return
+
+        if self.history_first is None:
+            start = self.live_first_line() + self.view.textCursor().blockNumber() + 1
+        else:
+            start = self.history_first + self.history.textCursor().blockNumber() + 1
+        self.log.flush()
+        self._search_generation += 1
+        generation = self._search_generation
+        self.status.setText(f"Searching for '{query}'...")
+        self.status.show()
+
+        def run():
+            cancelled = lambda: generation != self._search_generation
+            line = self.log.find(query, start, forward, cancelled)
+            if line < 0 and not cancelled():
+                line = self.log.find(query, 0 if forward else self.log.total_lines(), forward, cancelled)
+            self.searchFinished.emit(generation, line)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def search_finished(self, generation, line):
+        if generation != self._search_generation:
+            return
+        if line < 0:
+            self.status.setText(f"'{self.search_input.text()}' not found")
+            return
+        self.show_page(line - PAGE_LINES // 2, highlight=line)
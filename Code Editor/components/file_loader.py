@@ -0,0 +1,85 @@
+import os
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from components.code_editor import LARGE_FILE_BYTES, LARGE_FILE_LINES, LARGE_FILE_CHUNK_BYTES
+
+
+class FileLoadSignals(QObject):
+    progress = pyqtSignal(int)
+    textLoaded = pyqtSignal(str)
+    chunkLoaded = pyqtSignal(bytes)
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+
+class FileLoadJob(QRunnable):
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.large_file = False
+        self.signals = FileLoadSignals()
+        self._cancelled = False
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            with open(self.path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size > LARGE_FILE_BYTES:
+                    self.large_file = True
+                    self._stream(f.read, size)
+                    return
+
+                data = self._read_all(f, size)
+                if data is None:
+                    return
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.failed.emit(str(e))
+            return
+
+        text = data.decode('utf-8', errors='replace')
+        if not self._cancelled:
+            self.signals.textLoaded.emit(text)
+            self.signals.finished.emit()
+
+    def _read_all(self, f, size):
+        parts = []
+        lines = 0
+        done = 0
+        while True:
+            if self._cancelled:
+                return None
+            chunk = f.read(LARGE_FILE_CHUNK_BYTES)
+            if not chunk:
+                return b''.join(parts)
+            parts.append(chunk)
+            lines += chunk.count(b'\n')
+            done += len(chunk)
+            self._report(done, size)
+            # Lines are counted as the file is read, so a long file switches to streaming without a full read
+            if lines > LARGE_FILE_LINES:
+                self.large_file = True
+                read_so_far = iter(parts)
+                self._stream(lambda n: next(read_so_far, None) or f.read(n), size)
+                return None
+
+    def _stream(self, read, size):
+        done = 0
+        while not self._cancelled:
+            chunk = read(LARGE_FILE_CHUNK_BYTES)
+            if not chunk:
+                self.signals.finished.emit()
+                return
+            self.signals.chunkLoaded.emit(chunk)
+            done += len(chunk)
+            self._report(done, size)
+
+    def _report(self, done, size):
+        if size:
+            self.signals.progress.emit(min(100, done * 100 // size))
@@ -0,0 +1,228 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QCheckBox, QPushButton, QLabel
+from components.search_engine import SearchEngine
+
+SEARCH_DELAY_MS = 150
+
+
+class FindDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.editor = None
+        self.engine = None
+        self.anchor = None
+        self.setWindowTitle("Find")
+        self.setModal(False)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.search_as_you_type)
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.find_input = QLineEdit()
+        self.find_input.setPlaceholderText("Enter text to find")
+        layout.addWidget(self.find_input)
+
+        self.replace_input = QLineEdit()
+        self.replace_input.setPlaceholderText("Replace with")
+        layout.addWidget(self.replace_input)
+
+        options_layout = QHBoxLayout()
+        self.case_sensitive = QCheckBox("Case Sensitive")
+        self.whole_word = QCheckBox("Whole Word")
+        self.regex = QCheckBox("Regex")
+        self.count_label = QLabel("")
+        options_layout.addWidget(self.case_sensitive)
+        options_layout.addWidget(self.whole_word)
+        options_layout.addWidget(self.regex)
+        options_layout.addStretch()
+        options_layout.addWidget(self.count_label)
+        layout.addLayout(options_layout)
+
+        button_layout = QHBoxLayout()
+        find_next_btn = QPushButton("Find Next")
+        find_prev_btn = QPushButton("Find Previous")
+        replace_btn = QPushButton("Replace")
+        replace_all_btn = QPushButton("Replace All")
+        button_layout.addWidget(find_next_btn)
+        button_layout.addWidget(find_prev_btn)
+        button_layout.addWidget(replace_btn)
+        button_layout.addWidget(replace_all_btn)
+        layout.addLayout(button_layout)
+
+        find_next_btn.clicked.connect(lambda: self.find(True))
+        find_prev_btn.clicked.connect(lambda: self.find(False))
+        replace_btn.clicked.connect(self.replace)
+        replace_all_btn.clicked.connect(self.replace_all)
+        self.find_input.returnPressed.connect(lambda: self.find(True))
+
+        self.find_input.textChanged.connect(self.schedule_search)
+        self.case_sensitive.stateChanged.connect(self.schedule_search)
+        self.whole_word.stateChanged.connect(self.schedule_search)
+        self.regex.stateChanged.connect(self.schedule_search)
+
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #2d2d2d;
+                color: #d4d4d4;
+                border-radius: 6px;
+            }
+
+            QLabel {
+                color: #b0b0b0;
+                font-weight: 500;
+            }
+
+            QLineEdit {
+                background-color: #3d3d3d;
+                color: #d4d4d4;
+                border: 1px solid #4d4d4d;
+                border-radius: 4px;
+                padding: 6px 8px;
+                selection-background-color: #264f78;
+                min-height: 28px;
+            }
+
+            QLineEdit:focus {
+                border: 1px solid #569cd6;
+                outline: none;
+            }
+
+            QCheckBox {
+                background-color: transparent;
+                color: #d4d4d4;
+                spacing: 6px;
+            }
+
+            QCheckBox::indicator {
+                width: 18px;
+                height: 18px;
+                border-radius: 4px;
+                border: 1px solid #4d4d4d;
+                background-color: #3d3d3d;
+            }
+
+            QCheckBox::indicator:checked {
+                background-color: #569cd6;
+                border: 1px solid #569cd6;
+            }
+
+            QPushButton {
+                background-color: #3d3d3d;
+                color: #d4d4d4;
+                border: 1px solid #4d4d4d;
+                border-radius: 4px;
+                padding: 6px 12px;
+                min-width: 80px;
+                font-weight: 600;
+            }
+
+            QPushButton:hover {
+                background-color: #4d4d4d;
+                border-color: #569cd6;
+            }
+
+            QPushButton:pressed {
+                background-color: #505050;
+            }
+
+            QPushButton:default {
+                border: 2px solid #569cd6;
+            }
+        """)
+
+    def set_editor(self, editor):
+        if self.editor is not None:
+            self.engine.matchesReady.disconnect(self.update_count)
+            self.editor.destroyed.disconnect(self.editor_closed)
+        self.editor = editor
+        if editor.search_engine is None:
+            editor.search_engine = SearchEngine(editor, editor)
+        self.engine = editor.search_engine
+        self.engine.matchesReady.connect(self.update_count)
+        editor.destroyed.connect(self.editor_closed)
+        self.anchor = None
+        if editor.hasSelectedText() and "\n" not in editor.selectedText():
+            self.find_input.setText(editor.selectedText())
+        self.find_input.selectAll()
+        self.find_input.setFocus()
+        self.update_query()
+        self.update_count()
+
+    def editor_closed(self):
+        # Closing the tab deletes the editor and its engine along with it
+        self.editor = None
+        self.engine = None
+        self.anchor = None
+        self.search_timer.stop()
+        self.count_label.setText("")
+
+    def schedule_search(self):
+        self.search_timer.start(SEARCH_DELAY_MS)
+
+    def update_query(self):
+        if not self.engine:
+            return None
+        try:
+            pattern = self.engine.set_query(self.find_input.text(), self.regex.isChecked(),
+                                            self.case_sensitive.isChecked(), self.whole_word.isChecked())
+        except Exception as e:
+            self.count_label.setText("Invalid pattern")
+            self.count_label.setToolTip(str(e))
+            return None
+        self.count_label.setToolTip("")
+        return pattern
+
+    def search_as_you_type(self):
+        if not self.update_query():
+            return
+        # Typing searches from where the caret was when the search started
+        if self.anchor is None:
+            line, index = self.editor.getSelection()[:2] if self.editor.hasSelectedText() else self.editor.getCursorPosition()
+            self.anchor = self.engine.char_position(line, index)
+        self.engine.find(True, self.anchor)
+        self.update_count()
+
+    def find(self, forward=True):
+        if not self.update_query():
+            return
+        self.search_timer.stop()
+        self.anchor = None
+        if not self.engine.find(forward):
+            self.count_label.setText("No results")
+            return
+        self.update_count()
+
+    def replace(self):
+        if not self.update_query():
+            return
+        self.engine.replace(self.replace_input.text())
+        self.update_count()
+
+    def replace_all(self):
+        if not self.update_query():
+            return
+        try:
+            count = self.engine.replace_all(self.replace_input.text())
+        except Exception as e:
+            self.count_label.setText("Invalid replacement")
+            self.count_label.setToolTip(str(e))
+            return
+        self.count_label.setText(f"Replaced {count}")
+
+    def update_count(self, generation=None):
+        if not self.engine or not self.find_input.text() or self.engine.pattern is None:
+            self.count_label.setText("")
+            return
+        total = self.engine.count()
+        if total is None:
+            self.count_label.setText("Counting...")
+        elif total == 0:
+            self.count_label.setText("No results")
+        else:
+            index = self.engine.current_index()
+            self.count_label.setText(f"{index + 1} of {total}" if index is not None else f"{total} matches")
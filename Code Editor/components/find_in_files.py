@@ -0,0 +1,139 @@
+import os
+import re
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from PyQt6.QtCore import QObject, pyqtSignal
+from components.project_files import iter_project_files
+
+FILES_PER_TASK = 64
+MAX_MATCHES = 20000
+MAX_FILE_BYTES = 16 * 1024 * 1024
+MAX_LINE_PREVIEW = 200
+# Candidate lists this small are verified in the search thread, skipping the pool round trip
+INLINE_SEARCH_FILES = 256
+
+
+def compile_pattern(pattern, regex=False, case_sensitive=False):
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(pattern if regex else re.escape(pattern), flags)
+
+
+def is_binary(data):
+    return b"\0" in data[:8192]
+
+
+def search_files(paths, pattern, regex=False, case_sensitive=False):
+    # Runs in a worker process, so it must stay a plain picklable function
+    compiled = compile_pattern(pattern, regex, case_sensitive)
+    results = []
+    for path in paths:
+        try:
+            if os.path.getsize(path) > MAX_FILE_BYTES:
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            continue
+        if is_binary(data):
+            continue
+        text = data.decode('utf-8', errors='replace')
+        if not compiled.search(text):
+            continue
+        # splitlines() also breaks on form feeds and unicode separators, which the editor keeps inside a line
+        for line_number, line in enumerate(text.split("\n")):
+            if line.endswith("\r"):
+                line = line[:-1]
+            for match in compiled.finditer(line):
+                results.append((path, line_number, match.start(), match.end() - match.start(),
+                                line.strip()[:MAX_LINE_PREVIEW]))
+    return results
+
+
+class FileSearch(QObject):
+    resultsFound = pyqtSignal(int, list)
+    searchFinished = pyqtSignal(int, int, int, float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def start(self, root, pattern, regex=False, case_sensitive=False, paths=None):
+        self._generation += 1
+        generation = self._generation
+        threading.Thread(target=self._run, args=(generation, root, pattern, regex, case_sensitive, paths),
+                         daemon=True).start()
+        return generation
+
+    def cancel(self):
+        self._generation += 1
+
+    def shutdown(self):
+        self.cancel()
+        with self._pool_lock:
+            if self._pool:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawned workers, forking a process that runs Qt threads is not safe
+                context = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(mp_context=context)
+            return self._pool
+
+    def _run(self, generation, root, pattern, regex, case_sensitive, paths):
+        started = time.perf_counter()
+        # Narrowing can stat files, so it may be handed over as a callable to run here
+        if callable(paths):
+            paths = paths()
+        if paths is None:
+            paths = iter_project_files(root)
+        elif len(paths) <= INLINE_SEARCH_FILES:
+            results = search_files(paths, pattern, regex, case_sensitive)[:MAX_MATCHES]
+            if generation != self._generation:
+                return
+            if results:
+                self.resultsFound.emit(generation, results)
+            self.searchFinished.emit(generation, len(paths), len(results), time.perf_counter() - started)
+            return
+
+        match_count = 0
+        file_count = 0
+        futures = []
+        batch = []
+        try:
+            pool = self._get_pool()
+            for path in paths:
+                if generation != self._generation:
+                    break
+                batch.append(path)
+                file_count += 1
+                if len(batch) == FILES_PER_TASK:
+                    futures.append(pool.submit(search_files, batch, pattern, regex, case_sensitive))
+                    batch = []
+            if batch and generation == self._generation:
+                futures.append(pool.submit(search_files, batch, pattern, regex, case_sensitive))
+
+            for future in as_completed(futures):
+                if generation != self._generation or match_count >= MAX_MATCHES:
+                    break
+                results = future.result()
+                if results:
+                    results = results[:MAX_MATCHES - match_count]
+                    match_count += len(results)
+                    self.resultsFound.emit(generation, results)
+        except (BrokenProcessPool, OSError, RuntimeError):
+            with self._pool_lock:
+                self._pool = None
+        finally:
+            for future in futures:
+                future.cancel()
+
+        if generation == self._generation:
+            self.searchFinished.emit(generation, file_count, match_count, time.perf_counter() - started)
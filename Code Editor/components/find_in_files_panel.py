@@ -0,0 +1,193 @@
+import os
+import re
+import time
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QCheckBox, QLabel,
+                             QTreeWidget, QTreeWidgetItem, QPushButton)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from components.find_in_files import FileSearch, compile_pattern
+from components.trigram_index import TrigramIndexer
+
+SEARCH_DELAY_MS = 250
+
+
+class FindInFilesPanel(QWidget):
+    openRequested = pyqtSignal(str, int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = os.getcwd()
+        self.search = FileSearch(self)
+        self.search.resultsFound.connect(self.add_results)
+        self.search.searchFinished.connect(self.search_finished)
+        self.index = TrigramIndexer(self)
+        self.index.indexReady.connect(self.index_ready)
+        self.index.indexUpdated.connect(self.index_updated)
+        self.index_status = ""
+        self.narrowing = ""
+        self._generation = None
+        self._file_items = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.start_search)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(3)
+
+        options_layout = QHBoxLayout()
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Find in files")
+        self.regex_check = QCheckBox("Regex")
+        self.case_check = QCheckBox("Case Sensitive")
+        self.index_check = QCheckBox("Indexed")
+        self.index_check.setToolTip("Keep a trigram index of the project to narrow searches")
+        self.cancel_button = QPushButton("Cancel")
+        self.status_label = QLabel()
+        options_layout.addWidget(self.query_input, 1)
+        options_layout.addWidget(self.regex_check)
+        options_layout.addWidget(self.case_check)
+        options_layout.addWidget(self.index_check)
+        options_layout.addWidget(self.cancel_button)
+        options_layout.addWidget(self.status_label)
+        layout.addLayout(options_layout)
+
+        self.results = QTreeWidget()
+        self.results.setHeaderLabels(["Match", "Line"])
+        self.results.setColumnWidth(0, 600)
+        self.results.setUniformRowHeights(True)
+        layout.addWidget(self.results)
+
+        self.query_input.textChanged.connect(self.schedule_search)
+        self.query_input.returnPressed.connect(self.start_search)
+        self.regex_check.stateChanged.connect(self.schedule_search)
+        self.case_check.stateChanged.connect(self.schedule_search)
+        self.index_check.stateChanged.connect(self.toggle_index)
+        self.cancel_button.clicked.connect(self.cancel_search)
+        self.results.itemActivated.connect(self.item_activated)
+
+        self.setStyleSheet("""
+            QTreeWidget {
+                background-color: #1e1e1e;
+                color: #d4d4d4;
+                border: 1px solid #3c3c3c;
+            }
+            QLineEdit {
+                background-color: #191919;
+                color: #d4d4d4;
+                border: 1px solid #3c3c3c;
+                padding: 3px;
+            }
+            QCheckBox, QLabel {
+                color: #d4d4d4;
+            }
+            QPushButton {
+                background-color: #3d3d3d;
+                color: #d4d4d4;
+                border: 1px solid #4d4d4d;
+                border-radius: 4px;
+                padding: 3px 10px;
+            }
+        """)
+
+    def set_root(self, root):
+        self.root = root
+        if self.index_check.isChecked():
+            self.index.open_project(root)
+
+    def toggle_index(self, state):
+        if state == Qt.CheckState.Checked.value:
+            self.index_status = "building index..."
+            self.status_label.setText(self.index_status)
+            self.index.open_project(self.root)
+        else:
+            self.index.close_project()
+            self.index_status = ""
+
+    def files_changed(self, paths):
+        if self.index_check.isChecked():
+            self.index.update_paths(paths)
+
+    def index_ready(self, file_count, trigram_count, size, elapsed):
+        self.index_status = (f"index: {file_count} files, {trigram_count} trigrams, "
+                             f"{size / (1024 * 1024):.1f} MB, built in {elapsed:.1f} s")
+        self.status_label.setText(self.index_status)
+
+    def index_updated(self, file_count, elapsed):
+        self.status_label.setText(f"{self.index_status} (updated {file_count} files in {elapsed * 1000:.0f} ms)")
+
+    def focus_query(self, text=""):
+        if text:
+            self.query_input.setText(text)
+        self.query_input.setFocus()
+        self.query_input.selectAll()
+
+    def schedule_search(self):
+        # Typing abandons whatever query is still running
+        self.search.cancel()
+        self._timer.start(SEARCH_DELAY_MS)
+
+    def start_search(self):
+        self._timer.stop()
+        self.results.clear()
+        self._file_items.clear()
+        pattern = self.query_input.text()
+        if not pattern:
+            self.search.cancel()
+            self.status_label.setText("")
+            return
+        try:
+            compile_pattern(pattern, self.regex_check.isChecked(), self.case_check.isChecked())
+        except re.error as e:
+            self.search.cancel()
+            self.status_label.setText(f"Invalid regex: {e}")
+            return
+        self.status_label.setText("Searching...")
+
+        paths = None
+        self.narrowing = ""
+        regex = self.regex_check.isChecked()
+        case_sensitive = self.case_check.isChecked()
+        if self.index_check.isChecked():
+            paths = lambda: self.narrow(pattern, regex, case_sensitive)
+        self._generation = self.search.start(self.root, pattern, regex, case_sensitive, paths)
+
+    def narrow(self, pattern, regex, case_sensitive):
+        # Runs on the search thread, the index stat-checks files it has no watch on
+        started = time.perf_counter()
+        paths = self.index.candidates(pattern, regex, case_sensitive)
+        if paths is not None:
+            self.narrowing = f", index narrowed to {len(paths)} files in {(time.perf_counter() - started) * 1000:.1f} ms"
+        return paths
+
+    def cancel_search(self):
+        self._timer.stop()
+        self.search.cancel()
+        self.status_label.setText("Cancelled")
+
+    def add_results(self, generation, results):
+        if generation != self._generation:
+            return
+        self.results.setUpdatesEnabled(False)
+        for path, line, column, length, preview in results:
+            file_item = self._file_items.get(path)
+            if file_item is None:
+                file_item = QTreeWidgetItem(self.results, [os.path.relpath(path, self.root), ""])
+                file_item.setExpanded(True)
+                self._file_items[path] = file_item
+            item = QTreeWidgetItem(file_item, [preview, str(line + 1)])
+            item.setData(0, Qt.ItemDataRole.UserRole, (path, line, column))
+        self.results.setUpdatesEnabled(True)
+
+    def search_finished(self, generation, file_count, match_count, elapsed):
+        if generation != self._generation:
+            return
+        self.status_label.setText(
+            f"{match_count} matches in {len(self._file_items)} files "
+            f"({file_count} searched, {elapsed * 1000:.0f} ms{self.narrowing})")
+
+    def item_activated(self, item, column):
+        location = item.data(0, Qt.ItemDataRole.UserRole)
+        if location:
+            self.openRequested.emit(*location)
@@ -0,0 +1,118 @@
+# Long-lived interpreter for cell execution, started by the IDE and connected back to it over localhost
+import ast
+import builtins
+import io
+import json
+import linecache
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+
+
+class Connection:
+    def __init__(self, sock):
+        self.sock = sock
+        self.lock = threading.Lock()
+        self.reader = sock.makefile("rb")
+
+    def send(self, message):
+        data = json.dumps(message).encode('utf-8') + b"\n"
+        with self.lock:
+            self.sock.sendall(data)
+
+    def messages(self):
+        for line in self.reader:
+            yield json.loads(line)
+
+
+class SocketStream(io.TextIOBase):
+    def __init__(self, connection, name):
+        self.connection = connection
+        self.name = name
+        self.cell = None
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text:
+            self.connection.send({"id": self.cell, "stream": self.name, "text": text})
+        return len(text)
+
+
+def run_cell(message, namespace):
+    filename = message["filename"]
+    if message.get("source") is not None:
+        # Tracebacks from any cell read their lines from the buffer as it was sent
+        source = message["source"]
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    # Pad so line numbers in tracebacks match the editor
+    code = "\n" * message["line"] + message["code"]
+    tree = ast.parse(code, filename)
+    last = None
+    if tree.body and isinstance(tree.body[-1], ast.Expr):
+        last = ast.Expression(tree.body.pop().value)
+    exec(compile(tree, filename, "exec"), namespace)
+    if last is not None:
+        value = eval(compile(last, filename, "eval"), namespace)
+        if value is not None:
+            namespace["_"] = value
+            print(repr(value))
+
+
+def main():
+    port, token = int(sys.argv[1]), sys.argv[2]
+    connection = Connection(socket.create_connection(("127.0.0.1", port)))
+    connection.send({"hello": token, "pid": os.getpid()})
+
+    stdout = SocketStream(connection, "stdout")
+    stderr = SocketStream(connection, "stderr")
+    namespace = {"__name__": "__main__", "__builtins__": builtins}
+
+    # The IDE interrupts with SIGINT, which should only ever stop a running cell
+    busy = [False]
+
+    def interrupt(signum, frame):
+        if busy[0]:
+            raise KeyboardInterrupt
+
+    signal.signal(signal.SIGINT, interrupt)
+
+    for message in connection.messages():
+        if message.get("cwd"):
+            os.chdir(message["cwd"])
+            if message["cwd"] not in sys.path:
+                sys.path.insert(0, message["cwd"])
+        namespace["__file__"] = message["filename"]
+        stdout.cell = stderr.cell = message["id"]
+        sys.stdout, sys.stderr = stdout, stderr
+        started = time.perf_counter()
+        ok = True
+        busy[0] = True
+        try:
+            run_cell(message, namespace)
+        except SystemExit:
+            pass
+        except KeyboardInterrupt:
+            ok = False
+            print("KeyboardInterrupt", file=sys.stderr)
+        except BaseException as e:
+            ok = False
+            # Start the traceback at the user's code, not at this file
+            tb = e.__traceback__
+            while tb and tb.tb_frame.f_code.co_filename == __file__:
+                tb = tb.tb_next
+            traceback.print_exception(type(e), e, tb)
+        finally:
+            busy[0] = False
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+        connection.send({"id": message["id"], "done": True, "ok": ok, "elapsed": time.perf_counter() - started})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+import signal
+import secrets
+from PyQt6.QtCore import QObject, QProcess, pyqtSignal
+from PyQt6.QtNetwork import QTcpServer, QHostAddress
+
+KERNEL_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kernel.py")
+
+
+class KernelClient(QObject):
+    output = pyqtSignal(str, str)
+    cellFinished = pyqtSignal(int, bool, float)
+    stateChanged = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.process = None
+        self.server = None
+        self.socket = None
+        self.token = None
+        self.pid = None
+        self.pending = []
+        self.running = set()
+        self.buffer = b""
+        self.next_id = 1
+
+    def is_running(self):
+        return self.process is not None and self.process.state() != QProcess.ProcessState.NotRunning
+
+    def start(self):
+        if self.is_running():
+            return
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self._accept)
+        if not self.server.listen(QHostAddress.SpecialAddress.LocalHost, 0):
+            self.output.emit("notice", f"Could not start kernel: {self.server.errorString()}\n")
+            return
+        # Only the process we started knows the token, anything else connecting is dropped
+        self.token = secrets.token_hex(16)
+
+        self.process = QProcess(self)
+        self.process.readyReadStandardOutput.connect(
+            lambda: self.output.emit("stdout", self.process.readAllStandardOutput().data().decode('utf-8', errors='replace')))
+        self.process.readyReadStandardError.connect(
+            lambda: self.output.emit("stderr", self.process.readAllStandardError().data().decode('utf-8', errors='replace')))
+        self.process.finished.connect(self._process_finished)
+        self.process.start(sys.executable, ["-u", KERNEL_SCRIPT, str(self.server.serverPort()), self.token])
+        self.stateChanged.emit("starting")
+
+    def _accept(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            if self.socket is None:
+                self.socket = connection
+                self.socket.readyRead.connect(self._read)
+            else:
+                connection.abort()
+
+    def _read(self):
+        self.buffer += self.socket.readAll().data()
+        *lines, self.buffer = self.buffer.split(b"\n")
+        for line in lines:
+            if line:
+                self._handle(json.loads(line))
+
+    def _handle(self, message):
+        if "hello" in message:
+            if message["hello"] != self.token:
+                self.socket.abort()
+                self.socket = None
+                return
+            self.pid = message["pid"]
+            self.server.close()
+            self.stateChanged.emit("idle")
+            for pending in self.pending:
+                self._send(pending)
+            self.pending = []
+        elif message.get("done"):
+            self.running.discard(message["id"])
+            self.cellFinished.emit(message["id"], message["ok"], message["elapsed"])
+            if not self.running:
+                self.stateChanged.emit("idle")
+        else:
+            self.output.emit(message["stream"], message["text"])
+
+    def _send(self, message):
+        self.running.add(message["id"])
+        self.socket.write(json.dumps(message).encode('utf-8') + b"\n")
+        self.stateChanged.emit("busy")
+
+    def execute(self, code, filename, line=0, source=None, cwd=None):
+        self.start()
+        message = {"id": self.next_id, "code": code, "filename": filename, "line": line,
+                   "source": source, "cwd": cwd}
+        self.next_id += 1
+        if self.pid is None:
+            self.pending.append(message)
+        else:
+            self._send(message)
+        return message["id"]
+
+    def interrupt(self):
+        if self.pid is None or not self.running:
+            return
+        if sys.platform == "win32":
+            self.restart()
+        else:
+            os.kill(self.pid, signal.SIGINT)
+
+    def restart(self):
+        self.shutdown()
+        self.start()
+
+    def shutdown(self):
+        if self.process:
+            self.process.finished.disconnect()
+            self.process.kill()
+            self.process.waitForFinished(1000)
+        if self.socket:
+            self.socket.abort()
+        if self.server:
+            self.server.close()
+        self.process = self.socket = self.server = self.pid = None
+        self.pending = []
+        self.running = set()
+        self.buffer = b""
+
+    def _process_finished(self, exit_code):
+        self.output.emit("notice", f"\nKernel exited (exit code: {exit_code})\n")
+        self.process.finished.disconnect()
+        self.process = None
+        if self.socket:
+            self.socket.abort()
+        self.socket = self.server = self.pid = None
+        self.pending = []
+        self.running = set()
+        self.buffer = b""
+        self.stateChanged.emit("dead")
@@ -0,0 +1,74 @@
+import os
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QProgressBar
+from PyQt6.QtCore import Qt, pyqtSignal
+
+
+class LoadingWidget(QWidget):
+    cancelRequested = pyqtSignal()
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.job = None
+        self.editor = None
+        self.location = None
+        self.session_state = None
+        self.progress = None
+        self.value = 0
+
+    def showEvent(self, event):
+        # Restored sessions can hold many of these, so the widgets are only built once a tab is shown
+        if self.progress is None:
+            self.setup_ui()
+        super().showEvent(event)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.setSpacing(10)
+
+        self.label = QLabel(f"Loading {os.path.basename(self.path)}...")
+        self.label.setStyleSheet("color: #d4d4d4; font-size: 14px;")
+        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+        self.progress.setValue(self.value)
+        self.progress.setFixedWidth(300)
+        self.progress.setStyleSheet("""
+            QProgressBar {
+                background-color: #2c2c2c;
+                color: #d4d4d4;
+                border: 1px solid #3c3c3c;
+                border-radius: 3px;
+                text-align: center;
+            }
+            QProgressBar::chunk {
+                background-color: #3a8bca;
+            }
+        """)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setFixedWidth(100)
+        self.cancel_button.setStyleSheet("""
+            QPushButton {
+                background-color: #3d3d3d;
+                color: #d4d4d4;
+                border: 1px solid #4d4d4d;
+                border-radius: 4px;
+                padding: 6px 12px;
+            }
+            QPushButton:hover {
+                border-color: #569cd6;
+            }
+        """)
+        self.cancel_button.clicked.connect(self.cancelRequested.emit)
+
+        layout.addWidget(self.label, 0, Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.progress, 0, Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.cancel_button, 0, Qt.AlignmentFlag.AlignCenter)
+
+    def set_progress(self, value):
+        self.value = value
+        if self.progress:
+            self.progress.setValue(value)
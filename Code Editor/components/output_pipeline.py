@@ -0,0 +1,130 @@
+import codecs
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+FLUSH_INTERVAL_MS = 33
+FLUSH_BUDGET_MS = 12
+MIN_FLUSH_CHARS = 4 * 1024
+MAX_FLUSH_CHARS = 1024 * 1024
+MAX_BUFFERED_CHARS = 4 * 1024 * 1024
+STATS_INTERVAL = 1.0
+
+
+class OutputPipeline(QObject):
+    outputReady = pyqtSignal(list)
+    statsUpdated = pyqtSignal(float, float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.segments = []
+        self.buffered = 0
+        self.dropped = 0
+        self.decoders = {}
+        self.flush_chars = 64 * 1024
+
+        self.lines = 0
+        self.flush_time = 0.0
+        self.flushes = 0
+        self.stats_started = time.perf_counter()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(FLUSH_INTERVAL_MS)
+        self.timer.timeout.connect(self.flush)
+
+    def feed_bytes(self, data, channel="stdout"):
+        # A multibyte character can straddle two reads, so each channel keeps its own decoder state
+        decoder = self.decoders.get(channel)
+        if decoder is None:
+            decoder = self.decoders[channel] = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.feed(decoder.decode(data), channel)
+
+    def feed(self, text, channel="stdout"):
+        if not text:
+            return
+        # The view can't keep up, drop until the backlog drains and say how much was lost
+        if self.buffered + len(text) > MAX_BUFFERED_CHARS:
+            self.dropped += len(text)
+        else:
+            self._drop_notice()
+            self._append(text, channel)
+        if not self.timer.isActive():
+            if not self.flushes:
+                self.stats_started = time.perf_counter()
+            self.timer.start()
+
+    def _append(self, text, channel):
+        if self.segments and self.segments[-1][0] == channel:
+            self.segments[-1][1].append(text)
+        else:
+            self.segments.append((channel, [text]))
+        self.buffered += len(text)
+
+    def _drop_notice(self):
+        if self.dropped:
+            notice = f"\n[... {self.dropped} characters of output dropped ...]\n"
+            self.dropped = 0
+            self._append(notice, "notice")
+
+    def finish(self):
+        for channel, decoder in self.decoders.items():
+            self.feed(decoder.decode(b"", final=True), channel)
+        self.decoders = {}
+
+    def clear(self):
+        self.segments = []
+        self.buffered = 0
+        self.dropped = 0
+        self.decoders = {}
+        self.timer.stop()
+
+    def _take(self, limit):
+        batch = []
+        taken = 0
+        while self.segments and taken < limit:
+            channel, parts = self.segments.pop(0)
+            text = "".join(parts)
+            if taken + len(text) > limit:
+                # Cut on a line break so a frame never renders half a line
+                room = limit - taken
+                cut = text.rfind("\n", 0, room) + 1 or room
+                self.segments.insert(0, (channel, [text[cut:]]))
+                text = text[:cut]
+            batch.append((channel, text))
+            taken += len(text)
+        self.buffered -= taken
+        return batch
+
+    def flush(self):
+        if not self.segments:
+            self._drop_notice()
+        if not self.segments:
+            self.timer.stop()
+            self._report_stats()
+            return
+
+        batch = self._take(self.flush_chars)
+        started = time.perf_counter()
+        self.outputReady.emit(batch)
+        elapsed = time.perf_counter() - started
+        self.flush_time += elapsed
+
+        # Size the next frame so rendering stays inside the budget
+        if elapsed * 1000 > FLUSH_BUDGET_MS:
+            self.flush_chars = max(MIN_FLUSH_CHARS, self.flush_chars // 2)
+        elif elapsed * 1000 < FLUSH_BUDGET_MS / 2:
+            self.flush_chars = min(MAX_FLUSH_CHARS, self.flush_chars * 3 // 2)
+        self.flushes += 1
+        self.lines += sum(text.count("\n") for _, text in batch)
+        self._report_stats()
+
+    def _report_stats(self):
+        now = time.perf_counter()
+        elapsed = now - self.stats_started
+        if elapsed < STATS_INTERVAL:
+            return
+        flush_ms = self.flush_time / self.flushes * 1000 if self.flushes else 0.0
+        self.statsUpdated.emit(self.lines / elapsed, flush_ms)
+        self.lines = 0
+        self.flush_time = 0.0
+        self.flushes = 0
+        self.stats_started = now
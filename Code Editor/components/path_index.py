@@ -0,0 +1,230 @@
+import os
+import re
+import sys
+import time
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from PyQt6.QtCore import QObject, pyqtSignal
+from components.project_files import is_ignored_dir
+
+MAX_RESULTS = 50
+# Common characters in an unlikely order pass the prefilter for most of a big project, so the fuzzy tiers stop here
+MAX_FUZZY_CHECKS = 10000
+# Changes are kept beside the table until they reach this share of it, rebuilding 200k paths takes over half a second
+REBUILD_RATIO = 0.05
+MIN_REBUILD_CHANGES = 500
+PREFILTER_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789"
+BIT_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def fuzzy_pattern(query):
+    # Negated classes take the first occurrence of each character, so a failing line never backtracks
+    return re.compile("".join(f"[^\\n{re.escape(char)}]*{re.escape(char)}" for char in query))
+
+
+class PathTable:
+    def __init__(self, entries):
+        # Shortest paths first, so a scan that stops early has already seen the best candidates
+        entries = sorted(entries, key=lambda entry: (len(entry[0]) + len(entry[1]), entry[0], entry[1]))
+        self.directories = [sys.intern(directory) for directory, _ in entries]
+        self.names = [name for _, name in entries]
+        self.positions = None
+        paths = [os.path.join(directory, name) for directory, name in entries]
+
+        # Each table is searched as one newline separated string, which keeps it compact and lets str.find do the scanning.
+        # Offsets come from the lowered text, lowering can change a name's length ("İ" becomes two characters)
+        names = [name.lower() for name in self.names]
+        paths = [path.lower().replace("\\", "/") for path in paths]
+        self.name_text = "\n" + "\n".join(names) + "\n"
+        self.name_starts = array("L", accumulate((len(name) + 1 for name in names), initial=1))
+        self.path_text = "\n" + "\n".join(paths) + "\n"
+        self.path_starts = array("L", accumulate((len(path) + 1 for path in paths), initial=1))
+
+        # One bit per path for every letter and digit, so narrowing a query down is a few big integer ANDs
+        lines = self.path_text[1:-1].split("\n") if paths else []
+        self.char_bits = {char: int(bytes([char in line for line in lines]).translate(BIT_DIGITS) or b"0", 2)
+                          for char in PREFILTER_CHARS}
+
+    def __len__(self):
+        return len(self.names)
+
+    def path(self, entry):
+        return os.path.join(self.directories[entry], self.names[entry])
+
+    def candidate_flags(self, query):
+        bits = (1 << len(self)) - 1
+        for char in set(query):
+            bits &= self.char_bits.get(char, bits)
+        # The highest bit is the first path, so the binary digits read in table order
+        return format(bits, f"0{len(self)}b") if bits else ""
+
+    def entries(self):
+        return list(zip(self.directories, self.names))
+
+    def find(self, entry):
+        # Only updates look entries up, so the map is built on the first one, off the GUI thread
+        if self.positions is None:
+            self.positions = {item: index for index, item in enumerate(zip(self.directories, self.names))}
+        return self.positions.get(entry)
+
+    def find_under(self, directory):
+        found = []
+        needle = "\n" + directory.lower().replace("\\", "/") + "/"
+        position = self.path_text.find(needle)
+        while position >= 0:
+            index = bisect_right(self.path_starts, position + 1) - 1
+            if self.directories[index] == directory or self.directories[index].startswith(directory + os.sep):
+                found.append(index)
+            position = self.path_text.find(needle, position + 1)
+        return found
+
+
+def find_literal(table, names, needle, limit, found, seen):
+    text, starts = (table.name_text, table.name_starts) if names else (table.path_text, table.path_starts)
+    position = text.find(needle)
+    while position >= 0 and len(found) < limit:
+        entry = bisect_right(starts, position + 1) - 1
+        if entry not in seen:
+            seen.add(entry)
+            found.append(table.path(entry))
+        position = text.find(needle, starts[entry + 1] - 1)
+
+
+def find_fuzzy(table, names, pattern, flags, limit, found, seen, checks):
+    text, starts = (table.name_text, table.name_starts) if names else (table.path_text, table.path_starts)
+    match = pattern.match
+    entry = flags.find("1")
+    while entry >= 0 and len(found) < limit and checks > 0:
+        if entry not in seen:
+            checks -= 1
+            if match(text, starts[entry]):
+                seen.add(entry)
+                found.append(table.path(entry))
+        entry = flags.find("1", entry + 1)
+    return checks
+
+
+class PathIndex(QObject):
+    indexReady = pyqtSignal(int, float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        # The full table, files added since it was built and ids of its entries that have gone since
+        self.snapshot = (PathTable([]), PathTable([]), frozenset())
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def index_project(self, root):
+        self._generation += 1
+        self.root = os.path.abspath(root)
+        threading.Thread(target=self._run, args=(self.root, self._generation), daemon=True).start()
+
+    def set_entries(self, entries):
+        self.snapshot = (PathTable(entries), PathTable([]), frozenset())
+
+    def file_count(self):
+        table, recent, removed = self.snapshot
+        return len(table) - len(removed) + len(recent)
+
+    def update_files(self, paths):
+        if self.root is None:
+            return
+        threading.Thread(target=self._update, args=(self.root, self._generation, paths), daemon=True).start()
+
+    def _run(self, root, generation):
+        started = time.perf_counter()
+        entries = []
+        for directory, dirs, files in os.walk(root):
+            if generation != self._generation:
+                return
+            dirs[:] = [d for d in dirs if not is_ignored_dir(d)]
+            relative = os.path.relpath(directory, root)
+            relative = "" if relative == os.curdir else relative
+            entries.extend((relative, name) for name in files)
+
+        table = PathTable(entries)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self.snapshot = (table, PathTable([]), frozenset())
+        self.indexReady.emit(len(table), time.perf_counter() - started)
+
+    def _update(self, root, generation, paths):
+        started = time.perf_counter()
+        with self._lock:
+            if generation != self._generation:
+                return
+            table, recent, removed = self.snapshot
+            added = set(recent.entries())
+            removed = set(removed)
+            changed = False
+            for path in paths:
+                key = os.path.relpath(path, root)
+                parts = key.split(os.sep)
+                if parts[0] == os.pardir or any(is_ignored_dir(part) for part in parts[:-1]):
+                    continue
+                entry = (os.path.dirname(key), parts[-1])
+                index = table.find(entry)
+                if os.path.isfile(path):
+                    if index is None and entry not in added:
+                        added.add(entry)
+                        changed = True
+                    elif index in removed:
+                        removed.discard(index)
+                        changed = True
+                elif index is not None and index not in removed:
+                    removed.add(index)
+                    changed = True
+                elif entry in added:
+                    added.discard(entry)
+                    changed = True
+                elif not os.path.exists(path):
+                    # A removed directory only shows up as its own path
+                    gone = {item for item in added if item[0] == key or item[0].startswith(key + os.sep)}
+                    added -= gone
+                    gone_ids = set(table.find_under(key)) - removed
+                    removed |= gone_ids
+                    changed |= bool(gone or gone_ids)
+            if not changed:
+                return
+            if len(added) + len(removed) > max(MIN_REBUILD_CHANGES, len(table) * REBUILD_RATIO):
+                entries = [entry for index, entry in enumerate(table.entries()) if index not in removed]
+                self.snapshot = (PathTable(entries + list(added)), PathTable([]), frozenset())
+            else:
+                self.snapshot = (table, PathTable(added), frozenset(removed))
+        self.indexReady.emit(self.file_count(), time.perf_counter() - started)
+
+    def search(self, query, limit=MAX_RESULTS):
+        table, recent, removed = self.snapshot
+        query = "".join(query.lower().replace("\\", "/").split())
+        found = []
+        # Entries that have gone start out as seen, so no tier reports them
+        sources = [(table, set(removed)), (recent, set())]
+        if not query:
+            for source, seen in sources:
+                for entry in range(len(source)):
+                    if len(found) >= limit:
+                        break
+                    if entry not in seen:
+                        found.append(source.path(entry))
+            return found
+
+        # Ranked in tiers: file name prefix, file name substring, path substring, then fuzzy on the name and the path.
+        # A table that doesn't contain the query anywhere can skip the literal tiers after one scan
+        literal_sources = [(source, seen) for source, seen in sources if query in source.path_text]
+        for names, needle in [(True, "\n" + query), (True, query), (False, query)]:
+            if names and "/" in query:
+                continue
+            for source, seen in literal_sources:
+                find_literal(source, names, needle, limit, found, seen)
+        if len(found) < limit:
+            pattern = fuzzy_pattern(query)
+            checks = MAX_FUZZY_CHECKS
+            flags = [source.candidate_flags(query) for source, _ in sources]
+            for names in ([True, False] if "/" not in query else [False]):
+                for (source, seen), source_flags in zip(sources, flags):
+                    checks = find_fuzzy(source, names, pattern, source_flags, limit, found, seen, checks)
+        return found
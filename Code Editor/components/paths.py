@@ -0,0 +1,9 @@
+import os
+from PyQt6.QtCore import QStandardPaths
+
+
+def cache_dir(*parts):
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+    path = os.path.join(base, "squib-ide", *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,109 @@
+import os
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt, pyqtSignal
+
+MAX_ROWS = 2000
+
+
+class ProfilePanel(QWidget):
+    openRequested = pyqtSignal(str, int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.views = {}
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(3)
+
+        header = QHBoxLayout()
+        self.title_label = QLabel()
+        self.view_combo = QComboBox()
+        self.view_combo.currentTextChanged.connect(self.show_view)
+        self.close_button = QPushButton("Close")
+        self.close_button.clicked.connect(self.hide)
+        header.addWidget(self.title_label, 1)
+        header.addWidget(self.view_combo)
+        header.addWidget(self.close_button)
+        layout.addLayout(header)
+
+        self.table = QTableWidget()
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().hide()
+        self.table.itemActivated.connect(self.item_activated)
+        layout.addWidget(self.table)
+
+        self.setStyleSheet("""
+            QTableWidget {
+                background-color: #1e1e1e;
+                color: #d4d4d4;
+                border: 1px solid #3c3c3c;
+                gridline-color: #2d2d2d;
+            }
+            QHeaderView::section {
+                background-color: #252526;
+                color: #d4d4d4;
+                border: none;
+                padding: 3px;
+            }
+            QLabel {
+                color: #d4d4d4;
+            }
+            QComboBox, QPushButton {
+                background-color: #3d3d3d;
+                color: #d4d4d4;
+                border: 1px solid #4d4d4d;
+                border-radius: 4px;
+                padding: 3px 10px;
+            }
+        """)
+
+    def show_results(self, title, views, sort_column=None):
+        # views: name -> (columns, rows), each row is (values, (path, line) or None)
+        self.title_label.setText(title)
+        self.views = views
+        self.sort_column = sort_column
+        self.view_combo.blockSignals(True)
+        self.view_combo.clear()
+        self.view_combo.addItems(list(views))
+        self.view_combo.blockSignals(False)
+        self.view_combo.setVisible(len(views) > 1)
+        if views:
+            self.show_view(next(iter(views)))
+        self.show()
+
+    def show_view(self, name):
+        if name not in self.views:
+            return
+        columns, rows = self.views[name]
+        self.table.setSortingEnabled(False)
+        self.table.clear()
+        self.table.setColumnCount(len(columns))
+        self.table.setHorizontalHeaderLabels(columns)
+        # Sort before truncating so the rows kept are the costliest, not the first ones collected
+        if self.sort_column is not None:
+            rows = sorted(rows, key=lambda row: row[0][self.sort_column], reverse=True)
+        rows = rows[:MAX_ROWS]
+        self.table.setRowCount(len(rows))
+        for row, (values, location) in enumerate(rows):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                # Numbers go in as data so the column sorts numerically
+                item.setData(Qt.ItemDataRole.DisplayRole, value)
+                if location:
+                    item.setData(Qt.ItemDataRole.UserRole, location)
+                    item.setToolTip(f"{location[0]}:{location[1]}")
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        if self.sort_column is not None:
+            self.table.sortItems(self.sort_column, Qt.SortOrder.DescendingOrder)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+    def item_activated(self, item):
+        location = item.data(Qt.ItemDataRole.UserRole)
+        if location and os.path.isfile(location[0]):
+            self.openRequested.emit(location[0], max(0, location[1] - 1), 0)
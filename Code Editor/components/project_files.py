@@ -0,0 +1,18 @@
+import os
+
+IGNORED_DIRS = {
+    ".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox", ".idea", ".vscode",
+}
+
+
+def is_ignored_dir(name):
+    return name in IGNORED_DIRS or name.endswith(".egg-info")
+
+
+def iter_project_files(root, extensions=None):
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if not is_ignored_dir(d)]
+        for name in files:
+            if extensions is None or os.path.splitext(name)[1] in extensions:
+                yield os.path.join(directory, name)
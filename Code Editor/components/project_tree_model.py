@@ -0,0 +1,45 @@
+import os
+from PyQt6.QtCore import QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QFileSystemModel
+from components.project_files import is_ignored_dir
+
+
+class ProjectTreeModel(QSortFilterProxyModel):
+    def __init__(self, root=None, parent=None):
+        super().__init__(parent)
+        self.root = None
+        # The file system model only gathers a directory when the tree expands it,
+        # so rooting it at the project keeps both memory and watches proportional to what's open
+        self.files = QFileSystemModel(self)
+        self.setSourceModel(self.files)
+        if root:
+            self.set_root(root)
+
+    def set_root(self, root):
+        root = os.path.abspath(root)
+        if root != self.root:
+            self.root = root
+            self.files.setRootPath(root)
+        return self.root_index()
+
+    def root_index(self):
+        return self.mapFromSource(self.files.index(self.root)) if self.root else QModelIndex()
+
+    def file_path(self, index):
+        return self.files.filePath(self.mapToSource(index))
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.files.index(source_row, 0, source_parent)
+        # Only prune inside the project, the path down to the root has to stay reachable.
+        # A sibling like /src/app-old is not inside /src/app, so the separator is part of the check
+        if self.root is None:
+            return True
+        parent = os.path.normpath(self.files.filePath(source_parent))
+        if parent != self.root and not parent.startswith(os.path.join(self.root, "")):
+            return True
+        return not (self.files.isDir(index) and is_ignored_dir(self.files.fileName(index)))
+
+    def sort(self, column, order):
+        # Sorting in the source keeps directories ahead of files
+        self.files.sort(column, order)
+        super().sort(-1, order)
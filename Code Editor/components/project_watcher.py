@@ -0,0 +1,171 @@
+import os
+import time
+import threading
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from components.project_files import is_ignored_dir
+
+# inotify watches are a per-user resource, so a huge tree only gets partial coverage
+MAX_WATCHED_PATHS = 8192
+DEBOUNCE_MS = 300
+MAX_BATCH_DELAY = 2.0
+# Only these files get a watch of their own, anything else only shows up when it is added or removed
+WATCHED_EXTENSIONS = (".py",)
+
+
+class ProjectWatcher(QObject):
+    filesChanged = pyqtSignal(list)
+    _scanned = pyqtSignal(int, object, bool)
+
+    def __init__(self, parent=None, extensions=WATCHED_EXTENSIONS):
+        super().__init__(parent)
+        self.root = None
+        self.extensions = set(extensions)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._directory_changed)
+        self._watcher.fileChanged.connect(self._file_changed)
+        self._entries = {}
+        self._files = set()
+        self._pending = set()
+        self._first_pending = None
+        self._generation = 0
+        self._scanned.connect(self._scan_finished)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+
+    def set_root(self, root):
+        root = os.path.abspath(root)
+        if root == self.root:
+            return
+        self.root = root
+        self._clear()
+        self._generation += 1
+        self._start_scan(root, False)
+
+    def _start_scan(self, root, added):
+        threading.Thread(target=self._scan, args=(root, self._generation, added), daemon=True).start()
+
+    def _scan(self, root, generation, added):
+        # Walking a big tree is slow, only adding the watches has to happen on the GUI thread
+        directories = []
+        budget = MAX_WATCHED_PATHS
+        for directory, dirs, files in os.walk(root):
+            if generation != self._generation:
+                return
+            dirs[:] = [d for d in dirs if not is_ignored_dir(d)]
+            directories.append((directory, dirs, files))
+            budget -= 1 + sum(1 for name in files if self._is_watched_file(name))
+            # A directory that just appeared reports every file in it, so only the first scan stops at the budget
+            if budget <= 0 and not added:
+                break
+        self._scanned.emit(generation, directories, added)
+
+    def _scan_finished(self, generation, directories, added):
+        if generation != self._generation:
+            return
+        watching = True
+        for directory, dirs, files in directories:
+            if added:
+                self._queue_all(directory, files)
+            if watching:
+                watching = self._watch_directory(directory, dirs + files)
+
+    def watch_file(self, path):
+        self._add_file(os.path.abspath(path))
+
+    def _clear(self):
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._entries.clear()
+        self._files.clear()
+        self._pending.clear()
+        self._timer.stop()
+
+    def _has_budget(self):
+        return len(self._files) + len(self._entries) < MAX_WATCHED_PATHS
+
+    def _add_file(self, path):
+        if path in self._files:
+            return True
+        if not self._has_budget():
+            return False
+        if self._watcher.addPath(path):
+            self._files.add(path)
+        return True
+
+    def _is_watched_file(self, name):
+        return os.path.splitext(name)[1] in self.extensions
+
+    def _watch_directory(self, directory, names):
+        if not self._has_budget():
+            return False
+        self._watcher.addPath(directory)
+        self._entries[directory] = set(names)
+        for name in names:
+            if self._is_watched_file(name) and not self._add_file(os.path.join(directory, name)):
+                return False
+        return True
+
+    def _directory_changed(self, directory):
+        try:
+            names = set(os.listdir(directory))
+        except OSError:
+            # The directory itself went away, its parent may not have reported it yet
+            if directory in self._entries:
+                self._forget_directory(directory)
+            return
+        previous = self._entries.get(directory, set())
+        for name in names ^ previous:
+            path = os.path.join(directory, name)
+            if path in self._entries and name not in names:
+                self._forget_directory(path)
+            elif os.path.isdir(path):
+                if name in names and not is_ignored_dir(name):
+                    # A checkout or an unzip can add a big tree, so it is walked off the GUI thread too
+                    self._start_scan(path, True)
+            else:
+                self._queue(path)
+                if not self._is_watched_file(name):
+                    continue
+                if name in names:
+                    self._add_file(path)
+                else:
+                    self._files.discard(path)
+        self._entries[directory] = names
+
+    def _forget_directory(self, path):
+        # The files of a deleted directory get no events of their own, so report everything that was in it
+        self._queue(path)
+        for directory in [d for d in self._entries if d == path or d.startswith(path + os.sep)]:
+            for name in self._entries.pop(directory):
+                self._queue(os.path.join(directory, name))
+                self._files.discard(os.path.join(directory, name))
+
+    def _file_changed(self, path):
+        # Editors that save by renaming drop the watch, so put it back
+        self._files.discard(path)
+        if os.path.exists(path):
+            self._add_file(path)
+        self._queue(path)
+
+    def _queue_all(self, directory, names):
+        for name in names:
+            self._queue(os.path.join(directory, name))
+
+    def _queue(self, path):
+        if not self._pending:
+            self._first_pending = time.monotonic()
+        self._pending.add(path)
+        # Bursts like a branch switch collapse into one batch, but never wait forever
+        if time.monotonic() - self._first_pending >= MAX_BATCH_DELAY:
+            self._timer.start(0)
+        else:
+            self._timer.start(DEBOUNCE_MS)
+
+    def _flush(self):
+        if not self._pending:
+            return
+        paths = sorted(self._pending)
+        self._pending.clear()
+        self.filesChanged.emit(paths)
@@ -0,0 +1,131 @@
+import os
+import sys
+import struct
+import subprocess
+from PyQt6.QtCore import QObject, QSocketNotifier, pyqtSignal
+
+if os.name == "posix":
+    import pty
+    import fcntl
+    import signal
+    import termios
+
+MAX_READ_PER_EVENT = 1024 * 1024
+# Claims the terminal after setsid and then becomes the shell, so the shell gets job control.
+# A preexec_fn would do the same in the forked child, which isn't safe while the IDE's other threads run
+TAKE_TERMINAL = "import fcntl, os, sys, termios; fcntl.ioctl(0, termios.TIOCSCTTY, 0); os.execvp(sys.argv[1], sys.argv[1:])"
+
+
+class PtyShell(QObject):
+    output = pyqtSignal(bytes)
+    finished = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.process = None
+        self.master = None
+        self.notifier = None
+        self.write_notifier = None
+        self.pending = bytearray()
+
+    def is_running(self):
+        return self.process is not None and self.master is not None
+
+    def start(self, cwd=None, columns=120, rows=40):
+        shell = os.environ.get("SHELL", "/bin/sh")
+        master, slave = pty.openpty()
+        fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack("HHHH", rows, columns, 0, 0))
+        # Plain \n line endings, the console has no use for the terminal's \r\n
+        attributes = termios.tcgetattr(slave)
+        attributes[1] &= ~termios.ONLCR
+        termios.tcsetattr(slave, termios.TCSANOW, attributes)
+        env = dict(os.environ, TERM="dumb", PAGER="cat", GIT_PAGER="cat")
+        try:
+            self.process = subprocess.Popen([sys.executable, "-I", "-S", "-c", TAKE_TERMINAL, shell, "-i"],
+                                            stdin=slave, stdout=slave, stderr=slave, cwd=cwd, env=env,
+                                            start_new_session=True)
+        finally:
+            os.close(slave)
+
+        self.master = master
+        os.set_blocking(master, False)
+        self.notifier = QSocketNotifier(master, QSocketNotifier.Type.Read, self)
+        self.notifier.activated.connect(self._read)
+        self.write_notifier = QSocketNotifier(master, QSocketNotifier.Type.Write, self)
+        self.write_notifier.setEnabled(False)
+        self.write_notifier.activated.connect(self._write_pending)
+
+    def _read(self):
+        chunks = []
+        size = 0
+        # Bounded so a shell spewing output can't starve the event loop
+        while size < MAX_READ_PER_EVENT:
+            try:
+                data = os.read(self.master, 65536)
+            except BlockingIOError:
+                break
+            except OSError:
+                data = b""
+            if not data:
+                if chunks:
+                    self.output.emit(b"".join(chunks))
+                self._closed()
+                return
+            chunks.append(data)
+            size += len(data)
+        if chunks:
+            self.output.emit(b"".join(chunks))
+
+    def write(self, text):
+        if not self.is_running():
+            return False
+        # A background job can hold the terminal open after the shell itself has exited
+        if self.process.poll() is not None:
+            self._closed()
+            return False
+        self.pending += text.encode("utf-8")
+        self._write_pending()
+        return True
+
+    def _write_pending(self):
+        # A big paste can fill the terminal while the shell is busy echoing,
+        # so the rest waits for the master to become writable instead of blocking the GUI
+        while self.pending:
+            try:
+                written = os.write(self.master, self.pending)
+            except BlockingIOError:
+                break
+            except OSError:
+                self.pending.clear()
+                break
+            del self.pending[:written]
+        self.write_notifier.setEnabled(bool(self.pending))
+
+    def interrupt(self):
+        # The terminal turns ^C into SIGINT for whatever job is in the foreground, and drops unread input like a real one
+        self.pending.clear()
+        return self.write("\x03")
+
+    def _closed(self):
+        for notifier in (self.notifier, self.write_notifier):
+            notifier.setEnabled(False)
+            notifier.deleteLater()
+        os.close(self.master)
+        self.master = self.notifier = self.write_notifier = None
+        self.pending.clear()
+        try:
+            exit_code = self.process.wait(1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            exit_code = self.process.wait()
+        self.process = None
+        self.finished.emit(exit_code)
+
+    def terminate(self):
+        if not self.is_running():
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGHUP)
+        except OSError:
+            pass
+        self._closed()
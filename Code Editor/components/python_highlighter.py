@@ -1,13 +1,161 @@
+import os
+import glob
+import hashlib
+from collections import OrderedDict
+from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QFont, QColor
-from PyQt6.Qsci import QsciScintilla, QsciAPIs, QsciLexerHTML, QsciLexerCSS, QsciLexerRuby, QsciLexerPython, QsciLexerCPP, QsciLexerJava, QsciLexerJavaScript
+from PyQt6.Qsci import QSCINTILLA_VERSION_STR, QsciScintilla, QsciAPIs, QsciLexerHTML, QsciLexerCSS, QsciLexerRuby, QsciLexerPython, QsciLexerCPP, QsciLexerJava, QsciLexerJavaScript
+from components.paths import cache_dir
+
+# Lexer bundles nobody is using are kept around for quick reuse, up to this many
+MAX_IDLE_BUNDLES = 4
+# Every prepare rebuilds the whole API, so project word changes are collected for this long first
+WORDS_DEBOUNCE_MS = 1500
+
+
+class LexerBundle:
+    def __init__(self, language, lexer, api, keywords):
+        self.language = language
+        self.lexer = lexer
+        self.api = api
+        self.keywords = keywords
+        self.refs = 0
+        self.prepared = True
+        self.prepared_path = None
+        self.loaded_words = None
+        self.words_pending = False
+        if api is not None:
+            self.words_timer = QTimer(lexer)
+            self.words_timer.setSingleShot(True)
+            self.words_timer.setInterval(WORDS_DEBOUNCE_MS)
+            self.words_timer.timeout.connect(self._words_settled)
+            api.apiPreparationFinished.connect(self._preparation_finished)
+            self.load_words()
+
+    def load_words(self):
+        words = list(dict.fromkeys(self.keywords + sorted(_project_words.get(self.language, ()))))
+        current = set(words)
+        if self.loaded_words is None:
+            self.api.clear()
+            for word in words:
+                self.api.add(word)
+        else:
+            # Only apply what changed since the last load
+            for word in self.loaded_words - current:
+                self.api.remove(word)
+            for word in current - self.loaded_words:
+                self.api.add(word)
+        self.loaded_words = current
+
+        # Reuse the prepared data from an earlier run while the word list is unchanged
+        self.prepared_path = _prepared_api_path(self.language, words)
+        if os.path.exists(self.prepared_path) and self.api.loadPrepared(self.prepared_path):
+            self.prepared = True
+            return
+
+        self.prepared = False
+        self.api.prepare()
+
+    def words_changed(self):
+        self.words_timer.start()
+
+    def _words_settled(self):
+        if self.prepared:
+            self.load_words()
+        else:
+            self.words_pending = True
+
+    def _preparation_finished(self):
+        _save_prepared_api(self.api, self.prepared_path)
+        self.prepared = True
+        if self.words_pending:
+            self.words_pending = False
+            self.load_words()
+        else:
+            _evict_idle_bundles()
+
+
+_bundles = {}
+_idle_bundles = OrderedDict()
+_project_words = {}
+
+
+def set_project_words(language, words):
+    _project_words[language] = set(words)
+    _project_words_changed(language)
+
+
+def update_project_words(language, added, removed):
+    words = _project_words.setdefault(language, set())
+    words.difference_update(removed)
+    words.update(added)
+    _project_words_changed(language)
+
+
+def _project_words_changed(language):
+    bundle = _bundles.get(language)
+    if bundle and bundle.api is not None:
+        bundle.words_changed()
+
+
+def _acquire_bundle(language, factory):
+    bundle = _bundles.get(language)
+    if bundle is None:
+        bundle = factory()
+        _bundles[language] = bundle
+    _idle_bundles.pop(language, None)
+    bundle.refs += 1
+    return bundle
+
+
+def _release_bundle(bundle):
+    bundle.refs -= 1
+    if bundle.refs == 0:
+        _idle_bundles[bundle.language] = bundle
+        _evict_idle_bundles()
+
+
+def _prepared_api_path(language, words):
+    digest = hashlib.sha1()
+    digest.update(QSCINTILLA_VERSION_STR.encode())
+    digest.update(language.encode())
+    for word in words:
+        digest.update(b"\0" + word.encode())
+    slug = "".join(c if c.isalnum() else "_" for c in language)
+    return os.path.join(cache_dir("apis"), f"{slug}-{digest.hexdigest()[:16]}.pap")
+
+
+def _save_prepared_api(api, path):
+    if not api.savePrepared(path):
+        return
+    # Only the prepared file for the current word list is worth keeping
+    slug = os.path.basename(path).rsplit("-", 1)[0]
+    for stale in glob.glob(os.path.join(os.path.dirname(path), f"{slug}-*.pap")):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def _evict_idle_bundles():
+    for language in list(_idle_bundles):
+        if len(_idle_bundles) <= MAX_IDLE_BUNDLES:
+            break
+        # QScintilla crashes if a QsciAPIs is destroyed while it is still preparing
+        if not _idle_bundles[language].prepared:
+            continue
+        del _idle_bundles[language]
+        del _bundles[language]
+
 
 class PythonHighlighter:
     def __init__(self, editor, language="Python"):
         self.editor = editor
         self.language = language
 
-        current_font = QFont("Consolas", 12)
-        current_font.setFixedPitch(True)
+        self.font = QFont("Consolas", 12)
+        self.font.setFixedPitch(True)
 
         self.palette = {
             "paper": QColor("#2E2E2E"),      
@@ -26,6 +174,26 @@ class PythonHighlighter:
 
         }
 
+        # Lexers, themes and prepared APIs are shared by every editor using the same language
+        self.bundle = _acquire_bundle(self.language, self._create_bundle)
+        self.lexer = self.bundle.lexer
+        self.api = self.bundle.api
+
+        if self.lexer:
+            self.editor.setLexer(self.lexer)
+            self._setup_autocompletion()
+        else:
+            self.editor.setFont(self.font)
+
+            self.editor.setPaper(self.palette["paper"])
+            self.editor.setColor(self.palette["default"])
+
+    def release(self):
+        if self.bundle:
+            _release_bundle(self.bundle)
+            self.bundle = None
+
+    def _create_bundle(self):
         if self.language == "Python":
             self.lexer = QsciLexerPython()
         elif self.language in ("C++", "C"):
@@ -45,21 +213,16 @@ class PythonHighlighter:
         else: 
             self.lexer = None
 
-
-        
+        self.api = None
+        self.keywords = []
         if self.lexer:
-            
-            self.editor.setLexer(self.lexer)
-            self.lexer.setFont(current_font)
-            self.lexer.setDefaultFont(current_font)
+            self.lexer.setFont(self.font)
+            self.lexer.setDefaultFont(self.font)
 
             self._apply_soft_dark_theme_to_lexer()
             self._setup_apis_for_language(self.language)
-        else:
-            self.editor.setFont(current_font)
 
-            self.editor.setPaper(self.palette["paper"])
-            self.editor.setColor(self.palette["default"])
+        return LexerBundle(self.language, self.lexer, self.api, self.keywords)
 
     # Renamed method to reflect the dark theme
     def _apply_soft_dark_theme_to_lexer(self):
@@ -112,18 +275,16 @@ class PythonHighlighter:
             self.lexer.setColor(p["comment"], QsciLexerJava.CommentLine)
             self.lexer.setColor(p["comment"], QsciLexerJava.CommentDoc)
             self.lexer.setColor(p["keyword"], QsciLexerJava.Keyword)
-            self.lexer.setColor(p["class_func"], QsciLexerJava.ClassName) # May need bold font
-            self.lexer.setColor(p["class_func"], QsciLexerJava.FunctionMethodName) # May need bold font
+            self.lexer.setColor(p["class_func"], QsciLexerJava.GlobalClass) # May need bold font
             self.lexer.setColor(p["number"], QsciLexerJava.Number)
             self.lexer.setColor(p["operator"], QsciLexerJava.Operator)
-            self.lexer.setColor(p["property_misc"], QsciLexerJava.Annotation) # Using property_misc
 
         elif isinstance(self.lexer, QsciLexerJavaScript):
             self.lexer.setColor(p["default"], QsciLexerJavaScript.Default)
             self.lexer.setColor(p["identifier"], QsciLexerJavaScript.Identifier)
             self.lexer.setColor(p["string"], QsciLexerJavaScript.SingleQuotedString)
             self.lexer.setColor(p["string"], QsciLexerJavaScript.DoubleQuotedString)
-            self.lexer.setColor(p["string"], QsciLexerJavaScript.TemplateString)
+            self.lexer.setColor(p["string"], QsciLexerJavaScript.RawString)
             self.lexer.setColor(p["comment"], QsciLexerJavaScript.Comment)
             self.lexer.setColor(p["comment"], QsciLexerJavaScript.CommentLine)
             self.lexer.setColor(p["comment"], QsciLexerJavaScript.CommentDoc)
@@ -144,54 +305,34 @@ class PythonHighlighter:
             self.lexer.setColor(p["default"], QsciLexerHTML.OtherInTag)
             self.lexer.setColor(p["operator"], QsciLexerHTML.Entity)
 
-            def apply_sublexer_theme(sublexer_instance, base_style_map):
-                sublexer_instance.setPaper(p["paper"]) # Set dark background
-                sublexer_instance.setColor(p["default"]) # Set light default color
-                for style_const, color_key in base_style_map.items():
-                     if color_key in p:
-                         sublexer_instance.setColor(p[color_key], style_const)
-                     else:
-                         sublexer_instance.setColor(p["default"], style_const) # Fallback
-                sublexer_instance.setFont(self.lexer.font(sublexer_instance.defaultStyle()))
-                sublexer_instance.setDefaultFont(self.lexer.font(sublexer_instance.defaultStyle()))
-
-            js_lexer = QsciLexerJavaScript()
-            js_map = {
-                QsciLexerJavaScript.Default: "default", QsciLexerJavaScript.Identifier: "identifier",
-                QsciLexerJavaScript.SingleQuotedString: "string", QsciLexerJavaScript.DoubleQuotedString: "string",
-                QsciLexerJavaScript.TemplateString: "string", QsciLexerJavaScript.Comment: "comment",
-                QsciLexerJavaScript.CommentLine: "comment", QsciLexerJavaScript.CommentDoc: "comment",
-                QsciLexerJavaScript.Keyword: "keyword", QsciLexerJavaScript.Number: "number",
-                QsciLexerJavaScript.Operator: "operator", QsciLexerJavaScript.Regex: "value",
-            }
-            apply_sublexer_theme(js_lexer, js_map)
-            self.lexer.setSubLexer(js_lexer, QsciLexerHTML.Script)
-            
-            css_lexer = QsciLexerCSS()
-            css_map = {
-                 QsciLexerCSS.Default: "default", QsciLexerCSS.Selector: "tag_attr_selector",
-                 QsciLexerCSS.Property: "property_misc", QsciLexerCSS.Value: "value",
-                 QsciLexerCSS.Comment: "comment", QsciLexerCSS.IdSelector: "tag_attr_selector",
-                 QsciLexerCSS.ClassSelector: "tag_attr_selector", QsciLexerCSS.PseudoClass: "tag_attr_selector",
-                 QsciLexerCSS.Attribute: "property_misc", QsciLexerCSS.Number: "number",
-                 QsciLexerCSS.Operator: "operator", QsciLexerCSS.Important: "keyword",
-                 QsciLexerCSS.SingleQuotedString: "string", QsciLexerCSS.DoubleQuotedString: "string",
-            }
-            apply_sublexer_theme(css_lexer, css_map)
-            self.lexer.setSubLexer(css_lexer, QsciLexerHTML.Style)
+            # QsciLexerHTML styles embedded scripts itself, there are no sub-lexers to attach
+            self.lexer.setColor(p["default"], QsciLexerHTML.JavaScriptDefault)
+            self.lexer.setColor(p["identifier"], QsciLexerHTML.JavaScriptWord)
+            self.lexer.setColor(p["keyword"], QsciLexerHTML.JavaScriptKeyword)
+            self.lexer.setColor(p["string"], QsciLexerHTML.JavaScriptSingleQuotedString)
+            self.lexer.setColor(p["string"], QsciLexerHTML.JavaScriptDoubleQuotedString)
+            self.lexer.setColor(p["comment"], QsciLexerHTML.JavaScriptComment)
+            self.lexer.setColor(p["comment"], QsciLexerHTML.JavaScriptCommentLine)
+            self.lexer.setColor(p["comment"], QsciLexerHTML.JavaScriptCommentDoc)
+            self.lexer.setColor(p["number"], QsciLexerHTML.JavaScriptNumber)
+            self.lexer.setColor(p["operator"], QsciLexerHTML.JavaScriptSymbol)
+            self.lexer.setColor(p["value"], QsciLexerHTML.JavaScriptRegex)
+            for style in range(QsciLexerHTML.JavaScriptStart, QsciLexerHTML.JavaScriptRegex + 1):
+                self.lexer.setPaper(p["paper"], style)
 
 
         elif isinstance(self.lexer, QsciLexerCSS):
             self.lexer.setColor(p["default"], QsciLexerCSS.Default)
-            self.lexer.setColor(p["tag_attr_selector"], QsciLexerCSS.Selector)
-            self.lexer.setColor(p["tag_attr_selector"], QsciLexerCSS.IdSelector)
+            self.lexer.setColor(p["tag_attr_selector"], QsciLexerCSS.Tag)
+            self.lexer.setColor(p["tag_attr_selector"], QsciLexerCSS.IDSelector)
             self.lexer.setColor(p["tag_attr_selector"], QsciLexerCSS.ClassSelector)
             self.lexer.setColor(p["tag_attr_selector"], QsciLexerCSS.PseudoClass)
-            self.lexer.setColor(p["property_misc"], QsciLexerCSS.Property)
+            self.lexer.setColor(p["property_misc"], QsciLexerCSS.CSS1Property)
+            self.lexer.setColor(p["property_misc"], QsciLexerCSS.CSS2Property)
+            self.lexer.setColor(p["property_misc"], QsciLexerCSS.CSS3Property)
             self.lexer.setColor(p["value"], QsciLexerCSS.Value)
             self.lexer.setColor(p["comment"], QsciLexerCSS.Comment)
             self.lexer.setColor(p["property_misc"], QsciLexerCSS.Attribute)
-            self.lexer.setColor(p["number"], QsciLexerCSS.Number)
             self.lexer.setColor(p["operator"], QsciLexerCSS.Operator)
             self.lexer.setColor(p["keyword"], QsciLexerCSS.Important) # Use keyword color
             self.lexer.setColor(p["string"], QsciLexerCSS.SingleQuotedString)
@@ -300,11 +441,9 @@ class PythonHighlighter:
             ]
 
 
-        for keyword in keywords:
-            self.api.add(keyword)
-
-        self.api.prepare()
+        self.keywords = keywords
 
+    def _setup_autocompletion(self):
         self.editor.setAutoCompletionSource(QsciScintilla.AutoCompletionSource.AcsAll)
         self.editor.setAutoCompletionCaseSensitivity(False)
         self.editor.setAutoCompletionThreshold(2)
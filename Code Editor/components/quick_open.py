@@ -0,0 +1,122 @@
+import os
+import time
+from PyQt6.QtCore import Qt, QEvent, pyqtSignal
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QLabel
+
+
+class QuickOpenDialog(QDialog):
+    fileSelected = pyqtSignal(str)
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.setWindowTitle("Go to File")
+        self.setModal(False)
+        self.resize(560, 380)
+        self.setup_ui()
+        self.index.indexReady.connect(self.index_ready)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Search files by name")
+        self.query_input.installEventFilter(self)
+        layout.addWidget(self.query_input)
+
+        self.results = QListWidget()
+        self.results.setUniformItemSizes(True)
+        layout.addWidget(self.results)
+
+        self.status = QLabel("")
+        layout.addWidget(self.status)
+
+        self.query_input.textChanged.connect(self.update_results)
+        self.query_input.returnPressed.connect(self.open_selected)
+        self.results.itemActivated.connect(self.open_selected)
+
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #2d2d2d;
+                color: #d4d4d4;
+                border-radius: 6px;
+            }
+
+            QLabel {
+                color: #b0b0b0;
+                font-size: 9pt;
+            }
+
+            QLineEdit {
+                background-color: #3d3d3d;
+                color: #d4d4d4;
+                border: 1px solid #4d4d4d;
+                border-radius: 4px;
+                padding: 6px 8px;
+                selection-background-color: #264f78;
+                min-height: 28px;
+            }
+
+            QLineEdit:focus {
+                border: 1px solid #569cd6;
+                outline: none;
+            }
+
+            QListWidget {
+                background-color: #252526;
+                color: #d4d4d4;
+                border: 1px solid #4d4d4d;
+                border-radius: 4px;
+            }
+
+            QListWidget::item:selected {
+                background-color: #264f78;
+                color: #ffffff;
+            }
+        """)
+
+    def popup(self):
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.query_input.setFocus()
+        self.query_input.selectAll()
+        self.update_results()
+
+    def eventFilter(self, obj, event):
+        # Arrow keys move through the results without leaving the query box
+        if obj is self.query_input and event.type() == QEvent.Type.KeyPress:
+            if event.key() in (Qt.Key.Key_Down, Qt.Key.Key_Up, Qt.Key.Key_PageDown, Qt.Key.Key_PageUp):
+                self.results.keyPressEvent(event)
+                return True
+            if event.key() == Qt.Key.Key_Escape:
+                self.hide()
+                return True
+        return super().eventFilter(obj, event)
+
+    def index_ready(self, count, seconds):
+        if self.isVisible():
+            self.update_results()
+
+    def update_results(self):
+        started = time.perf_counter()
+        paths = self.index.search(self.query_input.text())
+        elapsed = (time.perf_counter() - started) * 1000
+
+        self.results.clear()
+        for path in paths:
+            directory, name = os.path.split(path)
+            item = QListWidgetItem(f"{name}    {directory}" if directory else name)
+            item.setData(Qt.ItemDataRole.UserRole, path)
+            item.setToolTip(path)
+            self.results.addItem(item)
+        if paths:
+            self.results.setCurrentRow(0)
+        self.status.setText(f"{self.index.file_count():,} files indexed, {elapsed:.1f} ms")
+
+    def open_selected(self):
+        item = self.results.currentItem()
+        if item is None or self.index.root is None:
+            return
+        self.hide()
+        self.fileSelected.emit(os.path.join(self.index.root, item.data(Qt.ItemDataRole.UserRole)))
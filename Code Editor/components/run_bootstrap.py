@@ -0,0 +1,77 @@
+# Started by the IDE ahead of time, waits on stdin for one script and runs it as __main__
+import json
+import linecache
+import os
+import sys
+import traceback
+import types
+import importlib
+import run_profilers
+
+RUNNER_FILES = {__file__, run_profilers.__file__}
+
+
+def preimport(names):
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"[runner] could not pre-import {name}: {e}", file=sys.stderr)
+
+
+def read_job(stream):
+    # One JSON header line with the byte length, then exactly that many bytes of source
+    header = stream.readline()
+    if not header:
+        return None, None
+    job = json.loads(header)
+    source = stream.read(job["length"]).decode('utf-8')
+    return job, source
+
+
+def run(job, source):
+    filename = job["filename"]
+    if job.get("cwd"):
+        os.chdir(job["cwd"])
+    sys.argv = [filename] + job.get("argv", [])
+    sys.path[0] = os.path.dirname(os.path.abspath(filename))
+
+    # Tracebacks read lines through linecache, so serve them from the buffer that actually ran
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    main = types.ModuleType("__main__")
+    main.__file__ = filename
+    main.__builtins__ = __builtins__
+    sys.modules["__main__"] = main
+    try:
+        code = compile(source, filename, "exec")
+        if job.get("profile"):
+            run_profilers.run_profiled(code, main.__dict__, job["profile"])
+        else:
+            exec(code, main.__dict__)
+    except SystemExit:
+        raise
+    except BaseException as e:
+        # Start the traceback at the user's code, not at the runner
+        tb = e.__traceback__
+        while tb and tb.tb_frame.f_code.co_filename in RUNNER_FILES:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb)
+        sys.exit(1)
+
+
+def main():
+    args = sys.argv[1:]
+    sys.path[0] = os.getcwd()
+    if "--preimport" in args:
+        names = args[args.index("--preimport") + 1]
+        preimport(name for name in names.split(",") if name)
+
+    job, source = read_job(sys.stdin.buffer)
+    if job is None:
+        return
+    run(job, source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# Profiling wrappers used by run_bootstrap.py inside the child process. Results go to a JSON file the IDE reads
+import json
+import os
+import sys
+import time
+import threading
+
+
+def write_results(path, results):
+    temporary = path + ".part"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(results, f)
+    os.replace(temporary, path)
+
+
+def profile_calls(code, namespace, options):
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        exec(code, namespace)
+    finally:
+        profiler.disable()
+        functions = []
+        for (filename, line, function), (primitive, calls, self_time, cumulative, callers) in pstats.Stats(profiler).stats.items():
+            # Built-ins without a profiled caller are this wrapper's exec() and disable()
+            if filename == "~" and not callers:
+                continue
+            functions.append({"file": filename, "line": line, "function": function, "calls": calls,
+                              "primitive": primitive, "self": self_time, "cumulative": cumulative})
+        write_results(options["output"], {"kind": "calls", "functions": functions})
+
+
+class LineRecorder:
+    # Time between two traced lines is charged to the first one, so a line's time excludes traced callees
+    def __init__(self, files):
+        self.files = set(files)
+        self.lines = {}
+        self.events = 0
+        self.last = None
+        self.last_time = 0
+        self.backend = "sys.monitoring" if hasattr(sys, "monitoring") else "settrace"
+
+    def hit(self, filename, line):
+        now = time.perf_counter_ns()
+        if self.last is not None:
+            self.lines[self.last][1] += now - self.last_time
+        key = (filename, line)
+        entry = self.lines.get(key)
+        if entry is None:
+            entry = self.lines[key] = [0, 0]
+        entry[0] += 1
+        self.events += 1
+        self.last = key
+        self.last_time = time.perf_counter_ns()
+
+    def start(self):
+        if self.backend == "sys.monitoring":
+            monitoring = sys.monitoring
+            # The script may run its own profiler, so take whichever tool slot is free
+            self.tool = next(tool for tool in (monitoring.PROFILER_ID, 3, 4) if monitoring.get_tool(tool) is None)
+            monitoring.use_tool_id(self.tool, "squib-ide line profiler")
+            monitoring.register_callback(self.tool, monitoring.events.LINE, self._monitor_line)
+            monitoring.set_events(self.tool, monitoring.events.LINE)
+        else:
+            sys.settrace(self._trace_call)
+            threading.settrace(self._trace_call)
+
+    def stop(self):
+        if self.backend == "sys.monitoring":
+            monitoring = sys.monitoring
+            monitoring.set_events(self.tool, 0)
+            monitoring.register_callback(self.tool, monitoring.events.LINE, None)
+            monitoring.free_tool_id(self.tool)
+        else:
+            sys.settrace(None)
+            threading.settrace(None)
+        if self.last is not None:
+            self.lines[self.last][1] += time.perf_counter_ns() - self.last_time
+            self.last = None
+
+    def _monitor_line(self, code, line):
+        if code.co_filename not in self.files:
+            return sys.monitoring.DISABLE
+        self.hit(code.co_filename, line)
+
+    def _trace_call(self, frame, event, arg):
+        if frame.f_code.co_filename not in self.files:
+            return None
+        return self._trace_line
+
+    def _trace_line(self, frame, event, arg):
+        if event == "line":
+            self.hit(frame.f_code.co_filename, frame.f_lineno)
+        return self._trace_line
+
+
+CALIBRATION_SOURCE = "def spin(n):\n    for i in range(n):\n        pass\n"
+
+
+def calibrate(iterations=20000):
+    # Run the same loop with and without tracing, the difference per event is the cost of one line hit
+    namespace = {}
+    exec(compile(CALIBRATION_SOURCE, "<calibration>", "exec"), namespace)
+    spin = namespace["spin"]
+    started = time.perf_counter()
+    spin(iterations)
+    plain = time.perf_counter() - started
+
+    recorder = LineRecorder(["<calibration>"])
+    recorder.start()
+    started = time.perf_counter()
+    try:
+        spin(iterations)
+    finally:
+        traced = time.perf_counter() - started
+        recorder.stop()
+    return max(0.0, traced - plain) / max(1, recorder.events)
+
+
+def profile_lines(code, namespace, options):
+    recorder = LineRecorder(options["files"])
+    recorder.start()
+    started = time.perf_counter()
+    try:
+        exec(code, namespace)
+    finally:
+        elapsed = time.perf_counter() - started
+        recorder.stop()
+        per_event = calibrate()
+        lines = [[filename, line, hits, ns] for (filename, line), (hits, ns) in recorder.lines.items()]
+        write_results(options["output"], {"kind": "lines", "backend": recorder.backend, "lines": lines,
+                                          "elapsed": elapsed, "events": recorder.events,
+                                          "overhead": per_event * recorder.events})
+
+
+MEMORY_TOP = 25
+
+
+class SnapshotHook(LineRecorder):
+    # Reuses the line tracing backends, but only the marked lines do anything
+    def __init__(self, markers, callback):
+        super().__init__(markers)
+        self.markers = {filename: set(lines) for filename, lines in markers.items()}
+        self.callback = callback
+
+    def hit(self, filename, line):
+        if line in self.markers.get(filename, ()):
+            self.callback(filename, line)
+
+    def _monitor_line(self, code, line):
+        if line not in self.markers.get(code.co_filename, ()):
+            return sys.monitoring.DISABLE
+        self.callback(code.co_filename, line)
+
+
+def peak_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def allocation_stats(statistics, ignored=()):
+    stats = []
+    for stat in statistics:
+        frame = stat.traceback[0]
+        if frame.filename in ignored:
+            continue
+        stats.append({"file": frame.filename, "line": frame.lineno, "size": stat.size, "count": stat.count,
+                      "size_diff": getattr(stat, "size_diff", stat.size),
+                      "count_diff": getattr(stat, "count_diff", stat.count)})
+        if len(stats) >= MEMORY_TOP:
+            break
+    return stats
+
+
+def profile_memory(code, namespace, options):
+    import tracemalloc
+
+    # Filtering whole snapshots is slow with many live blocks, so the runner's own sites are dropped from the stats
+    ignored = {tracemalloc.__file__, threading.__file__, __file__, "<frozen importlib._bootstrap>"}
+    snapshots = []
+    taken = set()
+
+    def snapshot(label, line=None):
+        snapshots.append((label, line, tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[0]))
+
+    def marker_reached(filename, line):
+        # First pass over a marker only, a marker inside a loop would otherwise snapshot every iteration
+        if (filename, line) not in taken:
+            taken.add((filename, line))
+            snapshot(f"{os.path.basename(filename)}:{line}", [filename, line])
+
+    tracemalloc.start(options.get("frames", 1))
+    hook = SnapshotHook(options.get("markers", {}), marker_reached)
+    hook.start()
+    snapshot("start")
+    try:
+        exec(code, namespace)
+    finally:
+        hook.stop()
+        snapshot("exit")
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        diffs = []
+        for (old_label, _, old, _), (new_label, _, new, _) in zip(snapshots, snapshots[1:]):
+            diffs.append({"label": f"{old_label} -> {new_label}", "stats": allocation_stats(new.compare_to(old, "lineno"), ignored)})
+        write_results(options["output"], {
+            "kind": "memory",
+            "snapshots": [{"label": label, "location": location, "current": current}
+                          for label, location, _, current in snapshots],
+            "diffs": diffs,
+            "top": allocation_stats(snapshots[-1][2].statistics("lineno"), ignored),
+            "peak_rss": peak_rss(),
+            "traced_peak": traced_peak,
+        })
+
+
+PROFILERS = {
+    "calls": profile_calls,
+    "lines": profile_lines,
+    "memory": profile_memory,
+}
+
+
+def run_profiled(code, namespace, options):
+    PROFILERS[options["kind"]](code, namespace, options)
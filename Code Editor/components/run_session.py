@@ -0,0 +1,142 @@
+from PyQt6.QtCore import QObject, QProcess, pyqtSignal
+from components.output_pipeline import OutputPipeline
+from components.console_view import ConsoleView, DEFAULT_MAX_LINES
+
+
+class RunSession(QObject):
+    stateChanged = pyqtSignal(str)
+    finished = pyqtSignal(int)
+
+    def __init__(self, name, max_lines=DEFAULT_MAX_LINES, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.process = None
+        self.shell = None
+        self.profile = None
+        self.state = "idle"
+
+        # Each session renders into its own console, so busy sessions never share a document
+        self.console = ConsoleView(max_lines)
+        self.pipeline = OutputPipeline(self)
+        self.pipeline.outputReady.connect(self.console.write_segments)
+
+    def is_running(self):
+        return self.process is not None and self.process.state() != QProcess.ProcessState.NotRunning
+
+    def shell_running(self):
+        return self.shell is not None and self.shell.is_running()
+
+    def run(self, program, arguments, description, log_name="run"):
+        process = QProcess(self)
+        self.attach(process, description, log_name)
+        process.start(program, arguments)
+        return process
+
+    def attach(self, process, description, log_name="run"):
+        self.stop()
+        self.pipeline.clear()
+        self.console.clear()
+        self.console.start_log(log_name)
+
+        # Warm runners arrive unparented, the session owns whatever it runs
+        process.setParent(self)
+        self.process = process
+        process.readyReadStandardOutput.connect(self.read_stdout)
+        process.readyReadStandardError.connect(self.read_stderr)
+        process.finished.connect(self.process_finished)
+
+        self.console.write(f"Running: {description}\n\n")
+        self.console.write("-" * 50 + "\n\n")
+        # A process started ahead of time may already have output waiting
+        if process.state() == QProcess.ProcessState.Running:
+            self.read_stdout()
+            self.read_stderr()
+        self.set_state("running")
+
+    def attach_shell(self, shell, description):
+        self.stop()
+        self.pipeline.clear()
+        self.console.clear()
+        self.console.start_log("shell")
+
+        self.shell = shell
+        shell.output.connect(self.read_shell)
+        shell.finished.connect(self.shell_finished)
+
+        self.console.write(f"Shell: {description}\n\n")
+        self.set_state("running")
+
+    def read_shell(self, data):
+        self.pipeline.feed_bytes(data, "stdout")
+
+    def shell_finished(self, exit_code):
+        self.shell = None
+        self.process_finished(exit_code)
+
+    def read_stdout(self):
+        if self.process:
+            self.pipeline.feed_bytes(self.process.readAllStandardOutput().data(), "stdout")
+
+    def read_stderr(self):
+        if self.process:
+            self.pipeline.feed_bytes(self.process.readAllStandardError().data(), "stderr")
+
+    def write_input(self, text):
+        # The terminal echoes whatever the shell reads, so nothing is echoed here
+        if self.shell_running():
+            return self.shell.write(text)
+        if not self.is_running():
+            return False
+        self.process.write(text.encode("utf-8"))
+        self.console.write(text)
+        return True
+
+    def interrupt(self):
+        return self.shell_running() and self.shell.interrupt()
+
+    def notice(self, text):
+        self.pipeline.feed(text, "notice")
+
+    def process_finished(self, exit_code):
+        self.read_stdout()
+        self.read_stderr()
+        self.pipeline.finish()
+        self.pipeline.feed("\n" + "-" * 50 + "\n", "notice")
+        if exit_code == 0:
+            self.pipeline.feed(f"Process finished successfully (exit code: {exit_code})\n", "notice")
+        else:
+            self.pipeline.feed(f"Process failed (exit code: {exit_code})\n", "notice")
+        if self.process:
+            self.process.deleteLater()
+        self.process = None
+        self.set_state("finished" if exit_code == 0 else "failed")
+        self.finished.emit(exit_code)
+
+    def set_state(self, state):
+        self.state = state
+        self.stateChanged.emit(state)
+
+    def stop(self):
+        if self.process:
+            self.process.readyReadStandardOutput.disconnect()
+            self.process.readyReadStandardError.disconnect()
+            self.process.finished.disconnect()
+            if self.process.state() != QProcess.ProcessState.NotRunning:
+                self.process.kill()
+                self.process.waitForFinished(1000)
+            self.process.deleteLater()
+            self.process = None
+            self.set_state("idle")
+        if self.shell:
+            self.shell.finished.disconnect()
+            self.shell.output.disconnect()
+            self.shell.terminate()
+            self.shell = None
+            self.set_state("idle")
+
+    def close(self):
+        self.stop()
+        self.pipeline.clear()
+        self.console.close_log()
+        self.console.deleteLater()
+        self.deleteLater()
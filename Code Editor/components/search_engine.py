@@ -0,0 +1,222 @@
+import re
+import bisect
+import threading
+from array import array
+from functools import lru_cache
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.Qsci import QsciScintilla
+
+RECOUNT_DELAY_MS = 300
+
+
+@lru_cache(maxsize=64)
+def compile_query(query, regex=False, case_sensitive=False, whole_word=False):
+    pattern = query if regex else re.escape(query)
+    if whole_word:
+        pattern = r"(?<!\w)(?:" + pattern + r")(?!\w)"
+    return re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+
+
+def overlaps_itself(text):
+    # True when a proper prefix is also a suffix, so two occurrences can share characters
+    return any(text[:size] == text[-size:] for size in range(1, len(text)))
+
+
+class SearchEngine(QObject):
+    matchesReady = pyqtSignal(int)
+
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self.query = None
+        self.pattern = None
+        self.text = None
+        self.line_starts = None
+        self.starts = None
+        self.ends = None
+        self._generation = 0
+        self._recount_timer = QTimer(self)
+        self._recount_timer.setSingleShot(True)
+        self._recount_timer.timeout.connect(self.recount)
+        self.editor.textChanged.connect(self.invalidate)
+
+    def set_query(self, query, regex=False, case_sensitive=False, whole_word=False):
+        key = (query, regex, case_sensitive, whole_word)
+        if key == self.query:
+            return self.pattern
+        previous, self.query = self.query, key
+        self.pattern = compile_query(*key) if query else None
+
+        # Extending a plain query can only remove matches, so filter the old ones.
+        # Not with whole words though, "foob" matches where "foo" was cut off by a word boundary,
+        # and not when the old query overlaps itself, finditer skipped some of its occurrences then
+        narrowing = (previous is not None and self.starts is not None and not regex and not previous[1]
+                     and not whole_word and previous[2:] == key[2:] and query.startswith(previous[0])
+                     and not overlaps_itself(previous[0] if case_sensitive else previous[0].lower()))
+        self._start_count(narrowing)
+        return self.pattern
+
+    def invalidate(self):
+        self.text = None
+        self.line_starts = None
+        self.starts = None
+        self.ends = None
+        self._generation += 1
+        if self.pattern is not None:
+            self._recount_timer.start(RECOUNT_DELAY_MS)
+
+    def recount(self):
+        self._start_count(False)
+
+    def snapshot(self):
+        if self.text is None:
+            self.text = self.editor.text()
+        return self.text
+
+    def _start_count(self, narrowing):
+        self._generation += 1
+        if self.pattern is None:
+            self.starts = self.ends = None
+            self.matchesReady.emit(self._generation)
+            return
+        previous = (self.starts, self.ends) if narrowing else None
+        self.starts = self.ends = None
+        threading.Thread(target=self._count, args=(self._generation, self.snapshot(), self.pattern, previous),
+                         daemon=True).start()
+
+    def _count(self, generation, text, pattern, previous):
+        starts = array('q')
+        ends = array('q')
+        if previous:
+            end = 0
+            for start in previous[0]:
+                # Like finditer, a match can't begin inside the one before it
+                if start < end:
+                    continue
+                match = pattern.match(text, start)
+                if match:
+                    end = match.end()
+                    starts.append(match.start())
+                    ends.append(match.end())
+        else:
+            for match in pattern.finditer(text):
+                if generation != self._generation:
+                    return
+                starts.append(match.start())
+                ends.append(match.end())
+        line_starts = self.line_starts
+        if line_starts is None:
+            line_starts = array('q', [0])
+            line_starts.extend(match.end() for match in re.finditer("\n", text))
+        if generation == self._generation:
+            self.starts, self.ends, self.line_starts = starts, ends, line_starts
+            self.matchesReady.emit(generation)
+
+    def count(self):
+        return None if self.starts is None else len(self.starts)
+
+    def current_index(self):
+        if self.starts is None or not self.editor.hasSelectedText():
+            return None
+        line, index, _, _ = self.editor.getSelection()
+        start = self.char_position(line, index)
+        position = bisect.bisect_left(self.starts, start)
+        if position < len(self.starts) and self.starts[position] == start:
+            return position
+        return None
+
+    def char_position(self, line, index):
+        if self.line_starts is not None and line < len(self.line_starts):
+            return self.line_starts[line] + index
+        text = self.snapshot()
+        offset = 0
+        for _ in range(line):
+            offset = text.index("\n", offset) + 1
+        return offset + index
+
+    def _line_index(self, position):
+        text = self.snapshot()
+        if self.line_starts is not None:
+            line = bisect.bisect_right(self.line_starts, position) - 1
+            return line, position - self.line_starts[line]
+        line = text.count("\n", 0, position)
+        return line, position - (text.rfind("\n", 0, position) + 1)
+
+    def _select(self, start, end):
+        line_from, index_from = self._line_index(start)
+        line_to, index_to = self._line_index(end)
+        self.editor.setSelection(line_from, index_from, line_to, index_to)
+        self.editor.ensureLineVisible(line_from)
+
+    def find(self, forward=True, from_position=None):
+        if self.pattern is None:
+            return False
+        text = self.snapshot()
+        if from_position is None:
+            if self.editor.hasSelectedText():
+                line_from, index_from, line_to, index_to = self.editor.getSelection()
+                line, index = (line_to, index_to) if forward else (line_from, index_from)
+            else:
+                line, index = self.editor.getCursorPosition()
+            from_position = self.char_position(line, index)
+
+        match = None
+        if forward:
+            match = self.pattern.search(text, from_position) or self.pattern.search(text, 0)
+        elif self.starts is not None:
+            position = bisect.bisect_left(self.starts, from_position) - 1
+            if self.starts:
+                self._select(self.starts[position], self.ends[position])
+                return True
+        else:
+            # Matches are not counted yet, walk backwards from the caret
+            for candidate in self.pattern.finditer(text, 0, from_position):
+                match = candidate
+            if match is None:
+                for candidate in self.pattern.finditer(text, from_position):
+                    match = candidate
+
+        if match is None:
+            return False
+        self._select(match.start(), match.end())
+        return True
+
+    def _expand(self, match, replacement):
+        return match.expand(replacement) if self.query[1] else replacement
+
+    def replace(self, replacement):
+        if self.pattern is None or not self.editor.hasSelectedText():
+            return self.find()
+        match = self.pattern.fullmatch(self.editor.selectedText())
+        if match:
+            self.editor.beginUndoAction()
+            self.editor.replaceSelectedText(self._expand(match, replacement))
+            self.editor.endUndoAction()
+        return self.find()
+
+    def replace_all(self, replacement):
+        if self.pattern is None:
+            return 0
+        text = self.snapshot()
+        matches = list(self.pattern.finditer(text))
+        if not matches:
+            return 0
+
+        # One target replacement over the matched span keeps this a single cheap edit,
+        # replacing matches one by one re-lays out the document every time
+        first, last = matches[0], matches[-1]
+        pieces = []
+        previous_end = first.start()
+        for match in matches:
+            pieces.append(text[previous_end:match.start()])
+            pieces.append(self._expand(match, replacement))
+            previous_end = match.end()
+        start = len(text[:first.start()].encode('utf-8'))
+        end = start + len(text[first.start():last.end()].encode('utf-8'))
+        new_text = "".join(pieces).encode('utf-8')
+
+        self.editor.beginUndoAction()
+        self.editor.SendScintilla(QsciScintilla.SCI_SETTARGETRANGE, start, end)
+        self.editor.SendScintilla(QsciScintilla.SCI_REPLACETARGET, len(new_text), new_text)
+        self.editor.endUndoAction()
+        return len(matches)
@@ -0,0 +1,327 @@
+import os
+import ast
+import copy
+import gzip
+import json
+import time
+import hashlib
+import threading
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from components.paths import cache_dir
+from components.project_files import iter_project_files, is_ignored_dir
+
+INDEX_VERSION = 1
+# Batches smaller than this are parsed in the indexer thread instead of a process pool
+PROCESS_POOL_THRESHOLD = 64
+CALLABLE_KINDS = ("function", "class", "method")
+# The whole index is rewritten on save, so bursts of updates share one write
+SAVE_DELAY_MS = 5000
+
+
+def _signature(args, bound=False):
+    if bound and (args.posonlyargs or args.args):
+        args = copy.copy(args)
+        if args.posonlyargs:
+            args.posonlyargs = args.posonlyargs[1:]
+        else:
+            args.args = args.args[1:]
+    return ast.unparse(args)
+
+
+def _class_symbols(node, symbols):
+    init_signature = ""
+    for item in node.body:
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            signature = _signature(item.args, bound=True)
+            if item.name == "__init__":
+                init_signature = signature
+                for sub in ast.walk(item):
+                    if (isinstance(sub, ast.Attribute) and isinstance(sub.ctx, ast.Store)
+                            and isinstance(sub.value, ast.Name) and sub.value.id == "self"):
+                        symbols.append(("attribute", f"{node.name}.{sub.attr}", ""))
+            symbols.append(("method", f"{node.name}.{item.name}", signature))
+        elif isinstance(item, ast.Assign):
+            for target in item.targets:
+                if isinstance(target, ast.Name):
+                    symbols.append(("attribute", f"{node.name}.{target.id}", ""))
+        elif isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
+            symbols.append(("attribute", f"{node.name}.{item.target.id}", ""))
+    symbols.append(("class", node.name, init_signature))
+
+
+def module_name(root, path):
+    relative = os.path.splitext(os.path.relpath(path, root))[0]
+    parts = relative.split(os.sep)
+    if parts[-1] == "__init__":
+        parts = parts[:-1] or [os.path.basename(os.path.abspath(root))]
+    return ".".join(parts)
+
+
+def parse_python_file(root, path):
+    # Runs in a worker process, so it must stay a plain picklable function
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            source = f.read()
+    except OSError:
+        return path, None
+
+    entry = {
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "hash": hashlib.sha1(source).hexdigest(),
+        "symbols": [],
+    }
+    try:
+        tree = ast.parse(source, path)
+    except (SyntaxError, ValueError):
+        return path, entry
+
+    symbols = [("module", module_name(root, path), "")]
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(("function", node.name, _signature(node.args)))
+        elif isinstance(node, ast.ClassDef):
+            _class_symbols(node, symbols)
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    symbols.append(("variable", target.id, ""))
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            symbols.append(("variable", node.target.id, ""))
+    entry["symbols"] = symbols
+    return path, entry
+
+
+def file_words(entry):
+    words = []
+    symbols = entry["symbols"] if entry else None
+    if not symbols:
+        return words
+    module_tail = symbols[0][1].rsplit(".", 1)[-1]
+    for kind, name, signature in symbols:
+        word = f"{name}({signature})" if kind in CALLABLE_KINDS else name
+        words.append(word)
+        if kind in ("function", "class", "variable"):
+            words.append(f"{module_tail}.{word}")
+    return words
+
+
+def api_words(files):
+    words = []
+    for entry in files.values():
+        words.extend(file_words(entry))
+    return words
+
+
+def index_path(root):
+    digest = hashlib.sha1(os.path.abspath(root).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir("symbols"), f"{digest}.json.gz")
+
+
+def load_index(root):
+    try:
+        with gzip.open(index_path(root), 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != INDEX_VERSION or data.get("root") != os.path.abspath(root):
+        return {}
+    return data["files"]
+
+
+def save_index(root, files):
+    data = {"version": INDEX_VERSION, "root": os.path.abspath(root), "files": files}
+    path = index_path(root)
+    with gzip.open(path + ".tmp", 'wt', encoding='utf-8') as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+
+
+class SymbolIndexer(QObject):
+    indexReady = pyqtSignal(object)
+    indexFinished = pyqtSignal(int, int, float)
+    indexUpdated = pyqtSignal(int, float)
+    wordsChanged = pyqtSignal(object, object)
+    _saveRequested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.files = {}
+        self._word_counts = Counter()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._unsaved = None
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._save_later)
+        self._saveRequested.connect(self._save_timer.start)
+
+    def index_project(self, root):
+        self._generation += 1
+        self.root = os.path.abspath(root)
+        threading.Thread(target=self._run, args=(self.root, self._generation), daemon=True).start()
+
+    def update_files(self, paths):
+        if self.root is None:
+            return
+        threading.Thread(target=self._update, args=(self.root, self._generation, paths), daemon=True).start()
+
+    def _run(self, root, generation):
+        started = time.perf_counter()
+
+        # Serve the last saved index right away while the fresh one is built
+        files = load_index(root)
+        if files:
+            counts = Counter(api_words(files))
+            with self._lock:
+                if generation != self._generation:
+                    return
+                self.files = files
+                self._word_counts = counts
+            self.indexReady.emit(list(counts))
+
+        paths = list(iter_project_files(root, {".py"}))
+        results = self._parse_paths(root, paths, generation)
+        if results is None:
+            return
+        files = {os.path.relpath(path, root): entry for path, entry in results if entry is not None}
+        counts = Counter(api_words(files))
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self.files = files
+            self._word_counts = counts
+        self._save(root, files)
+        symbol_count = sum(len(entry["symbols"]) for entry in files.values())
+        self.indexReady.emit(list(counts))
+        self.indexFinished.emit(len(files), symbol_count, time.perf_counter() - started)
+
+    def _update(self, root, generation, paths):
+        started = time.perf_counter()
+        with self._lock:
+            if generation != self._generation:
+                return
+            files = dict(self.files)
+            previous = {}
+            changed = False
+            to_parse = []
+            for path in paths:
+                key = os.path.relpath(path, root)
+                parts = key.split(os.sep)
+                if parts[0] == os.pardir or any(is_ignored_dir(part) for part in parts[:-1]):
+                    continue
+                if not path.endswith(".py"):
+                    if not os.path.exists(path):
+                        # A removed directory can show up as just its own path
+                        for removed in [name for name in files if name.startswith(key + os.sep)]:
+                            previous.setdefault(removed, files.pop(removed))
+                            changed = True
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    if key in files:
+                        previous.setdefault(key, files.pop(key))
+                        changed = True
+                    continue
+
+                entry = files.get(key)
+                if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                    continue
+                if entry:
+                    try:
+                        with open(path, 'rb') as f:
+                            digest = hashlib.sha1(f.read()).hexdigest()
+                    except OSError:
+                        digest = None
+                    # Touched but identical content, e.g. a checkout back and forth
+                    if digest == entry["hash"]:
+                        files[key] = dict(entry, mtime=stat.st_mtime, size=stat.st_size)
+                        changed = True
+                        continue
+                to_parse.append(path)
+
+            results = self._parse_paths(root, to_parse, generation)
+            if results is None or generation != self._generation:
+                return
+            for path, entry in results:
+                key = os.path.relpath(path, root)
+                previous.setdefault(key, files.get(key))
+                if entry is None:
+                    files.pop(key, None)
+                else:
+                    files[key] = entry
+                changed = True
+
+            if not changed:
+                return
+            self.files = files
+            added, removed = self._count_words(previous, files)
+            self._unsaved = generation
+        self._saveRequested.emit()
+        if added or removed:
+            self.wordsChanged.emit(added, removed)
+        self.indexUpdated.emit(len(to_parse), time.perf_counter() - started)
+
+    def _count_words(self, previous, files):
+        # Words can come from several files, so one only goes away with its last file
+        counts = self._word_counts
+        added = set()
+        removed = set()
+        for entry in previous.values():
+            for word in file_words(entry):
+                counts[word] -= 1
+                if not counts[word]:
+                    del counts[word]
+                    removed.add(word)
+        for key in previous:
+            for word in file_words(files.get(key)):
+                if word not in counts:
+                    added.add(word)
+                counts[word] += 1
+        return list(added - removed), list(removed - added)
+
+    def _parse_paths(self, root, paths, generation):
+        results = []
+        if len(paths) > PROCESS_POOL_THRESHOLD:
+            try:
+                # Spawned workers, forking a process that runs Qt threads is not safe
+                context = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(mp_context=context) as pool:
+                    for result in pool.map(parse_python_file, [root] * len(paths), paths, chunksize=32):
+                        if generation != self._generation:
+                            pool.shutdown(cancel_futures=True)
+                            return None
+                        results.append(result)
+                return results
+            except (BrokenProcessPool, OSError, RuntimeError):
+                results = []
+
+        for path in paths:
+            if generation != self._generation:
+                return None
+            results.append(parse_python_file(root, path))
+        return results
+
+    def _save_later(self):
+        # No lock here, an update holds it while parsing and this runs on the GUI thread
+        if self._unsaved != self._generation:
+            return
+        self._unsaved = None
+        threading.Thread(target=self._save, args=(self.root, self.files), daemon=True).start()
+
+    def _save(self, root, files):
+        with self._save_lock:
+            try:
+                save_index(root, files)
+            except OSError:
+                pass
@@ -0,0 +1,359 @@
+import os
+import re
+import time
+import pickle
+import hashlib
+import threading
+from array import array
+from re import _parser as sre_parse
+from PyQt6.QtCore import QObject, pyqtSignal
+from components.paths import cache_dir
+from components.project_files import iter_project_files, is_ignored_dir
+from components.find_in_files import MAX_FILE_BYTES, is_binary
+from components.project_watcher import WATCHED_EXTENSIONS
+
+INDEX_VERSION = 1
+# Once this share of file ids is dead the postings are rebuilt without them
+COMPACT_RATIO = 0.3
+
+
+def _trigram_keys(data):
+    data = data.lower()
+    return {data[i] << 16 | data[i + 1] << 8 | data[i + 2] for i in range(len(data) - 2)}
+
+
+def _literal_trigrams(literal, case_sensitive):
+    data = literal.encode('utf-8')
+    keys = set()
+    for i in range(len(data) - 2):
+        chunk = data[i:i + 3]
+        # The index folds ASCII case only, so non-ASCII is unusable for case-insensitive queries
+        if not case_sensitive and max(chunk) > 127:
+            continue
+        keys |= _trigram_keys(chunk)
+    return keys
+
+
+def _required_literals(parsed, literals):
+    run = []
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(arg))
+            continue
+        if run:
+            literals.append("".join(run))
+            run = []
+        if op is sre_parse.SUBPATTERN:
+            _required_literals(arg[-1], literals)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and arg[0] >= 1:
+            _required_literals(arg[2], literals)
+    if run:
+        literals.append("".join(run))
+
+
+def query_literals(pattern, regex):
+    if not regex:
+        return [pattern]
+    literals = []
+    try:
+        _required_literals(sre_parse.parse(pattern), literals)
+    except re.error:
+        return []
+    return literals
+
+
+def _read_text_file(path):
+    try:
+        if os.path.getsize(path) > MAX_FILE_BYTES:
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    return None if is_binary(data) else data
+
+
+class TrigramIndex:
+    def __init__(self, root, watched=WATCHED_EXTENSIONS):
+        self.root = root
+        self.watched = set(watched)
+        self.paths = []
+        self.meta = {}
+        self.ids = {}
+        self.postings = {}
+        self.unwatched = set()
+        self.dead = 0
+        self.shared = False
+        self.owned = set()
+
+    def copy(self):
+        index = TrigramIndex(self.root, self.watched)
+        index.paths = list(self.paths)
+        index.meta = dict(self.meta)
+        index.ids = dict(self.ids)
+        index.postings = dict(self.postings)
+        index.unwatched = set(self.unwatched)
+        index.dead = self.dead
+        index.shared = True
+        return index
+
+    def add_file(self, path):
+        key = os.path.relpath(path, self.root)
+        self.remove_file(key)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        # Binary and oversized files keep their metadata so they are not re-read every time
+        self.meta[key] = (stat.st_mtime, stat.st_size)
+        data = _read_text_file(path)
+        if data is None:
+            return
+        file_id = len(self.paths)
+        self.paths.append(key)
+        self.ids[key] = file_id
+        if os.path.splitext(key)[1] not in self.watched:
+            self.unwatched.add(file_id)
+        # New ids are always the largest, so appending keeps every posting list sorted
+        for trigram in _trigram_keys(data):
+            posting = self.postings.get(trigram)
+            if posting is None or (self.shared and trigram not in self.owned):
+                # A copy shares its posting lists with the index searches may still be reading
+                posting = self.postings[trigram] = array('I', posting or ())
+                if self.shared:
+                    self.owned.add(trigram)
+            posting.append(file_id)
+
+    def remove_file(self, key):
+        self.meta.pop(key, None)
+        file_id = self.ids.pop(key, None)
+        if file_id is None:
+            return
+        self.paths[file_id] = None
+        self.unwatched.discard(file_id)
+        self.dead += 1
+
+    def is_stale(self, path):
+        key = os.path.relpath(path, self.root)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return key in self.meta
+        return self.meta.get(key) != (stat.st_mtime, stat.st_size)
+
+    def stale_unwatched(self):
+        # Edits to files without a watch never reach the index, only a stat shows them
+        stale = []
+        for file_id in self.unwatched:
+            path = os.path.join(self.root, self.paths[file_id])
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stale.append(path)
+                continue
+            if self.meta.get(self.paths[file_id]) != (stat.st_mtime, stat.st_size):
+                stale.append(path)
+        return stale
+
+    def compact(self):
+        if self.dead < COMPACT_RATIO * max(1, len(self.paths)):
+            return
+        remap = array('I', [0]) * len(self.paths)
+        paths = []
+        for old_id, key in enumerate(self.paths):
+            if key is not None:
+                remap[old_id] = len(paths)
+                paths.append(key)
+        postings = {}
+        for trigram, posting in self.postings.items():
+            alive = array('I', (remap[i] for i in posting if self.paths[i] is not None))
+            if alive:
+                postings[trigram] = alive
+        self.paths = paths
+        self.ids = {key: i for i, key in enumerate(paths)}
+        self.postings = postings
+        self.unwatched = {remap[i] for i in self.unwatched}
+        self.dead = 0
+        self.shared = False
+        self.owned = set()
+
+    def candidates(self, pattern, regex=False, case_sensitive=False):
+        keys = set()
+        for literal in query_literals(pattern, regex):
+            keys |= _literal_trigrams(literal, case_sensitive)
+        if not keys:
+            return None
+
+        postings = []
+        for key in keys:
+            posting = self.postings.get(key)
+            if posting is None:
+                postings = [()]
+                break
+            postings.append(posting)
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            if not matches:
+                break
+            matches.intersection_update(posting)
+        return [os.path.join(self.root, self.paths[i]) for i in sorted(matches) if self.paths[i] is not None]
+
+    def file_count(self):
+        return len(self.ids)
+
+    def size_bytes(self):
+        return sum(posting.itemsize * len(posting) for posting in self.postings.values())
+
+
+def index_path(root):
+    digest = hashlib.sha1(os.path.abspath(root).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir("trigrams"), f"{digest}.pickle")
+
+
+def load_index(root, watched=WATCHED_EXTENSIONS):
+    try:
+        with open(index_path(root), 'rb') as f:
+            data = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return None
+    if data.get("version") != INDEX_VERSION or data.get("root") != root:
+        return None
+    index = TrigramIndex(root, watched)
+    index.paths = data["paths"]
+    index.meta = data["meta"]
+    index.ids = {key: i for i, key in enumerate(index.paths) if key is not None}
+    index.unwatched = {i for key, i in index.ids.items() if os.path.splitext(key)[1] not in index.watched}
+    index.dead = len(index.paths) - len(index.ids)
+    index.postings = {}
+    for trigram, raw in data["postings"].items():
+        posting = array('I')
+        posting.frombytes(raw)
+        index.postings[trigram] = posting
+    return index
+
+
+def save_index(index):
+    data = {
+        "version": INDEX_VERSION,
+        "root": index.root,
+        "paths": index.paths,
+        "meta": index.meta,
+        "postings": {trigram: posting.tobytes() for trigram, posting in index.postings.items()},
+    }
+    path = index_path(index.root)
+    with open(path + ".tmp", 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+
+
+class TrigramIndexer(QObject):
+    indexReady = pyqtSignal(int, int, int, float)
+    indexUpdated = pyqtSignal(int, float)
+
+    def __init__(self, parent=None, watched_extensions=WATCHED_EXTENSIONS):
+        super().__init__(parent)
+        self.root = None
+        self.index = None
+        self.watched_extensions = watched_extensions
+        self._generation = 0
+        # The lock only guards swapping the index, searches on the GUI thread must never wait on a build
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+    def open_project(self, root):
+        self._generation += 1
+        self.root = os.path.abspath(root)
+        self.index = None
+        threading.Thread(target=self._build, args=(self.root, self._generation), daemon=True).start()
+
+    def close_project(self):
+        self._generation += 1
+        with self._lock:
+            self.index = None
+
+    def update_paths(self, paths):
+        if self.index is None:
+            return
+        threading.Thread(target=self._update, args=(self._generation, paths), daemon=True).start()
+
+    def candidates(self, pattern, regex=False, case_sensitive=False):
+        # Called from the search thread, re-indexing stale unwatched files here keeps narrowing exact
+        with self._lock:
+            index = self.index
+        if index is None:
+            return None
+        stale = index.stale_unwatched()
+        if stale:
+            self._update(self._generation, stale)
+            with self._lock:
+                index = self.index
+            if index is None:
+                return None
+        return index.candidates(pattern, regex, case_sensitive)
+
+    def _build(self, root, generation):
+        started = time.perf_counter()
+
+        # A saved index only needs the files that changed since it was written
+        index = load_index(root, self.watched_extensions)
+        if index is None:
+            index = TrigramIndex(root, self.watched_extensions)
+        seen = set()
+        for path in iter_project_files(root):
+            if generation != self._generation:
+                return
+            seen.add(os.path.relpath(path, root))
+            if index.is_stale(path):
+                index.add_file(path)
+        for key in list(index.meta):
+            if key not in seen:
+                index.remove_file(key)
+        index.compact()
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self.index = index
+        self._save(index)
+        self.indexReady.emit(index.file_count(), len(index.postings), index.size_bytes(),
+                             time.perf_counter() - started)
+
+    def _update(self, generation, paths):
+        started = time.perf_counter()
+        # Updates work on a copy and swap it in, so they queue behind each other but never block a search
+        with self._update_lock:
+            index = self.index
+            if index is None or generation != self._generation:
+                return
+            index = index.copy()
+            updated = 0
+            for path in paths:
+                key = os.path.relpath(path, index.root)
+                parts = key.split(os.sep)
+                if parts[0] == os.pardir or any(is_ignored_dir(part) for part in parts[:-1]):
+                    continue
+                if not index.is_stale(path):
+                    continue
+                if os.path.isfile(path):
+                    index.add_file(path)
+                else:
+                    index.remove_file(key)
+                updated += 1
+            if not updated:
+                return
+            index.compact()
+            with self._lock:
+                if generation != self._generation:
+                    return
+                self.index = index
+            self._save(index)
+        self.indexUpdated.emit(updated, time.perf_counter() - started)
+
+    def _save(self, index):
+        with self._save_lock:
+            try:
+                save_index(index)
+            except OSError:
+                pass
@@ -0,0 +1,73 @@
+import os
+import sys
+import json
+from PyQt6.QtCore import QObject, QProcess, QTimer
+
+BOOTSTRAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_bootstrap.py")
+
+
+def bootstrap_arguments(preimports=()):
+    arguments = ["-u", BOOTSTRAP]
+    if preimports:
+        arguments += ["--preimport", ",".join(preimports)]
+    return arguments
+
+
+def send_source(process, source, filename, cwd=None, profile=None):
+    data = source.encode('utf-8')
+    header = json.dumps({"length": len(data), "filename": filename, "cwd": cwd, "profile": profile})
+    process.write(header.encode('utf-8') + b"\n" + data)
+
+
+class WarmRunnerPool(QObject):
+    def __init__(self, size=1, preimports=(), parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.preimports = tuple(preimports)
+        self.idle = []
+
+    def configure(self, size, preimports):
+        preimports = tuple(preimports)
+        if (size, preimports) == (self.size, self.preimports):
+            return
+        self.size = size
+        self.preimports = preimports
+        self.shutdown()
+        self.fill()
+
+    def fill(self):
+        self.idle = [process for process in self.idle if process.state() != QProcess.ProcessState.NotRunning]
+        while len(self.idle) < self.size:
+            self.idle.append(self._spawn())
+
+    def _spawn(self):
+        process = QProcess(self)
+        process.setProgram(sys.executable)
+        process.setArguments(bootstrap_arguments(self.preimports))
+        process.finished.connect(lambda *args, process=process: self._worker_exited(process))
+        process.start()
+        return process
+
+    def _worker_exited(self, process):
+        # Died before it was used, most likely a broken pre-import. Don't respawn in a loop
+        if process in self.idle:
+            self.idle.remove(process)
+            process.deleteLater()
+
+    def take(self):
+        self.idle = [process for process in self.idle if process.state() != QProcess.ProcessState.NotRunning]
+        process = self.idle.pop(0) if self.idle else None
+        if process:
+            process.finished.disconnect()
+            process.setParent(None)
+        # Workers are single use, start the replacement once this run is underway
+        QTimer.singleShot(0, self.fill)
+        return process
+
+    def shutdown(self):
+        for process in self.idle:
+            process.finished.disconnect()
+            process.kill()
+            process.waitForFinished(1000)
+            process.deleteLater()
+        self.idle = []
@@ -1,10 +1,13 @@
 import sys
 import os
+import json
+import math
+import linecache
 import subprocess
 import time
-from PyQt6.QtCore import Qt, QDir, QProcess, QRegularExpression, QSize, pyqtSignal
+from PyQt6.QtCore import Qt, QDir, QEvent, QProcess, QRegularExpression, QSettings, QSize, QTimer, QThreadPool, pyqtSignal
 from PyQt6.QtGui import (QMovie, QPainter, QSyntaxHighlighter, QPalette, QTextCharFormat, QColor, QFont,
-                         QTextCursor, QAction, QIcon, QFileSystemModel, 
+                         QTextCursor, QAction, QIcon, 
                          QRegularExpressionValidator, QKeySequence, QFontMetrics, QTextDocument)
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QSplitter, QTreeView, QTabWidget,
@@ -13,10 +16,29 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QLabel, QPushButton, QSizePolicy, QListWidget,
                             QListWidgetItem, QStyleFactory, QComboBox, QDialog, QLineEdit, QCheckBox)
 from PyQt6.Qsci import QsciScintilla, QsciLexerPython
-from components.code_editor import CodeEditor
+from components.code_editor import CodeEditor, HEATMAP_COLORS
+from components.file_loader import FileLoadJob
+from components.loading_widget import LoadingWidget
 from components.custom_title_bar import CustomTitleBar
 from components.welcome_widget import WelcomeWidget
-from components.python_highlighter import PythonHighlighter
+from components.python_highlighter import PythonHighlighter, set_project_words, update_project_words
+from components.symbol_index import SymbolIndexer
+from components.project_watcher import ProjectWatcher
+from components.project_tree_model import ProjectTreeModel
+from components.find_in_files_panel import FindInFilesPanel
+from components.find_dialog import FindDialog
+from components.path_index import PathIndex
+from components.quick_open import QuickOpenDialog
+from components.console_view import DEFAULT_MAX_LINES
+from components.run_session import RunSession
+from components.pty_shell import PtyShell
+from components.warm_runner import WarmRunnerPool, bootstrap_arguments, send_source
+from components.kernel_client import KernelClient
+from components.profile_panel import ProfilePanel
+from components.paths import cache_dir
+
+# Restored tabs are added to the tab bar a few per event loop turn, each one relayouts every close button
+RESTORE_TABS_PER_TICK = 8
 
 class IDE(QMainWindow):
     def __init__(self):
@@ -27,11 +49,28 @@ class IDE(QMainWindow):
         
         
         self.current_file = None
+        self.find_dialog = None
+        self.quick_open = None
+        self.settings = QSettings("squib-ide", "ide")
+        self.runner_pool = WarmRunnerPool(*self.runner_settings(), self)
         self.unsaved_changes = False
+        self.symbol_indexer = SymbolIndexer(self)
+        self.symbol_indexer.indexReady.connect(self.project_symbols_ready)
+        self.symbol_indexer.indexFinished.connect(self.project_index_finished)
+        self.symbol_indexer.indexUpdated.connect(self.project_index_updated)
+        self.symbol_indexer.wordsChanged.connect(self.project_words_changed)
+        self.project_watcher = ProjectWatcher(self)
+        self.project_watcher.filesChanged.connect(self.symbol_indexer.update_files)
+        self.path_index = PathIndex(self)
+        self.project_watcher.filesChanged.connect(self.path_index.update_files)
+        self.defer_tab_loading = False
+        self.restored_tabs = []
+        self.restored_front = 0
         self.setup_ui()
         self.setup_connections()
         self.apply_styles()
         self.old_pos = None
+        self.restore_session()
 
     def setup_ui(self):
     # Central Widget and Main Layout
@@ -62,12 +101,11 @@ class IDE(QMainWindow):
         
 
         # File Explorer
-        self.file_model = QFileSystemModel()
-        self.file_model.setRootPath(QDir.rootPath())
+        self.file_model = ProjectTreeModel(os.getcwd(), self)
         
         self.file_tree = QTreeView()
         self.file_tree.setModel(self.file_model)
-        self.file_tree.setRootIndex(self.file_model.index(os.getcwd()))
+        self.file_tree.setRootIndex(self.file_model.root_index())
         self.file_tree.setHeaderHidden(True)
         self.file_tree.setAnimated(True)
         self.file_tree.setIndentation(1)
@@ -93,15 +131,26 @@ class IDE(QMainWindow):
         self.tab_widget.setStyleSheet("padding: 0px;")
         self.tab_widget.ensurePolished()
 
-        # Console
-        self.console = QTextEdit()
+        # Console, every tab gets its own run session and console page
+        self.console = QStackedWidget()
+        self.console_placeholder = QLabel("Nothing has run in this tab yet")
+        self.console_placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.console_placeholder.setStyleSheet("color: #6b6b6b;")
+        self.console.addWidget(self.console_placeholder)
+        self.sessions = {}
+        self.kernel_session = None
 
         self.userConsole = QLineEdit()        
         self.userConsole.editingFinished.connect(self.push_console)
+        self.userConsole.installEventFilter(self)
 
-        self.process = None
         self.userConsole.setPlaceholderText("Terminal")
 
+        self.kernel = KernelClient(self)
+        self.kernel.output.connect(self.kernel_output)
+        self.kernel.cellFinished.connect(self.cell_finished)
+        self.kernel.stateChanged.connect(self.kernel_state_changed)
+
         
         
         self.main_layout.setContentsMargins(1, 1, 1, 1) 
@@ -157,7 +206,7 @@ class IDE(QMainWindow):
             }
                                        """)
         self.console.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 /* Base background and text colors */
                 background-color: #1e1e1e;  /* Dark background */
                 color: #d4d4d4;  /* Light gray text */
@@ -183,17 +232,17 @@ class IDE(QMainWindow):
             }
 
             /* Placeholder text styling */
-            QTextEdit::placeholder {
+            QPlainTextEdit::placeholder {
                 color: #6b6b6b;
                 font-style: italic;
             }
 
             /* Optional: Hover and focus effects */
-            QTextEdit:hover {
+            QPlainTextEdit:hover {
                 border-color: #6b6b6b;
             }
 
-            QTextEdit:focus {
+            QPlainTextEdit:focus {
                 border-color: white;  /* Accent color for focus state */
                 outline: none;
             }
@@ -226,7 +275,18 @@ class IDE(QMainWindow):
         self.stacked_widget = QStackedWidget()
         self.stacked_editor_console = QStackedWidget()
         
+        self.find_in_files = FindInFilesPanel()
+        self.find_in_files.openRequested.connect(self.open_location)
+        self.project_watcher.filesChanged.connect(self.find_in_files.files_changed)
+        self.find_in_files.hide()
+
+        self.profile_panel = ProfilePanel()
+        self.profile_panel.openRequested.connect(self.open_location)
+        self.profile_panel.hide()
+
         self.editor_splitter.addWidget(self.tab_widget)
+        self.editor_splitter.addWidget(self.find_in_files)
+        self.editor_splitter.addWidget(self.profile_panel)
         self.console_splitter.addWidget(self.console)
         self.console_splitter.addWidget(self.userConsole)
         self.stacked_widget.addWidget(self.welcome_screen)
@@ -266,15 +326,25 @@ class IDE(QMainWindow):
         
         self.main_splitter.setSizes([150, 750, 300])
         self.editor_splitter.setSizes([750, 120, 200])
-        self.console.setReadOnly(True)
         self.file_tree.setMaximumWidth(0)
 
         self.welcome_screen.newRequested.connect(self.new_file)
         self.welcome_screen.openRequested.connect(self.open_file)
         
         self.setup_find_shortcut()
+        self.setup_cell_shortcuts()
         self.statusBar().showMessage("Ready")
         self.statusBar().setStyleSheet("padding-bottom:4px")
+
+        self.large_file_badge = QLabel()
+        self.large_file_badge.setStyleSheet("color: #FFB86C; padding-right: 8px;")
+        self.large_file_badge.hide()
+        self.statusBar().addPermanentWidget(self.large_file_badge)
+
+        self.output_stats_label = QLabel()
+        self.output_stats_label.setStyleSheet("color: #b0b0b0; padding-right: 8px;")
+        self.output_stats_label.hide()
+        self.statusBar().addPermanentWidget(self.output_stats_label)
         self.installEventFilter(self)
 
 
@@ -435,6 +505,9 @@ class IDE(QMainWindow):
             ("Open File", "document-open", self.open_file),
             ("Save File", "document-save", self.save_file),
             ("Run Code", "system-run", self.run_code),
+            ("Profile", "utilities-system-monitor", self.profile_code),
+            ("Line Profile", "utilities-system-monitor", self.line_profile_code),
+            ("Memory Profile", "utilities-system-monitor", self.memory_profile_code),
             
         ]
         toolbar.addWidget(self.label)
@@ -461,6 +534,16 @@ class IDE(QMainWindow):
         toolbar.addWidget(self.console_label)
         toolbar.addWidget(self.show_console_check)
         self.show_console_check.stateChanged.connect(self.show_console)
+
+        self.warm_runner_label = QLabel()
+        self.warm_runner_label.setText('Warm Runner')
+        self.warm_runner_label.setToolTip("Run code in a pre-started interpreter (pre-imports: runner/preimports setting)")
+        self.warm_runner_check = QCheckBox(self)
+        self.warm_runner_check.setChecked(self.settings.value("runner/warm", False, type=bool))
+        toolbar.addWidget(self.warm_runner_label)
+        toolbar.addWidget(self.warm_runner_check)
+        self.warm_runner_check.stateChanged.connect(self.toggle_warm_runner)
+        self.toggle_warm_runner()
         
         toolbar.setStyleSheet("""
         QLabel {
@@ -506,11 +589,39 @@ class IDE(QMainWindow):
     def setup_connections(self):
         self.file_tree.doubleClicked.connect(self.open_file_from_tree)
         self.tab_widget.tabCloseRequested.connect(self.close_tab)
+        self.tab_widget.currentChanged.connect(self.update_large_file_badge)
+        self.tab_widget.currentChanged.connect(self.show_current_session)
+        self.tab_widget.currentChanged.connect(self.tab_activated)
+    def toggle_warm_runner(self):
+        warm = self.warm_runner_check.isChecked()
+        self.settings.setValue("runner/warm", warm)
+        if warm:
+            # The pool settings are only edited in the settings file, so pick up changes whenever it is switched on
+            self.runner_pool.configure(*self.runner_settings())
+            self.runner_pool.fill()
+        else:
+            self.runner_pool.shutdown()
+
+    def runner_settings(self):
+        self.settings.sync()
+        preimports = [name.strip() for name in self.settings.value("runner/preimports", "", type=str).split(",")]
+        return self.settings.value("runner/pool_size", 1, type=int), [name for name in preimports if name]
+
     def show_console(self, state):
         if state == Qt.CheckState.Checked.value:
             self.stacked_editor_console.setMaximumWidth(250)
         else:
             self.stacked_editor_console.setMaximumWidth(0)
+    def closeEvent(self, event):
+        self.save_session()
+        self.find_in_files.search.shutdown()
+        for session in self.sessions.values():
+            session.stop()
+            session.console.close_log()
+        self.runner_pool.shutdown()
+        self.kernel.shutdown()
+        super().closeEvent(event)
+
     def resizeEvent(self, event):
         self.update_gif_position()
         super().resizeEvent(event)
@@ -540,51 +651,302 @@ class IDE(QMainWindow):
             
             QDir.setCurrent(directory) 
 
-            self.file_model.setRootPath(directory)
+            self.file_tree.setRootIndex(self.file_model.set_root(directory))
+
+            self.set_project_root(directory)
+
+    def set_project_root(self, directory):
+        self.project_watcher.set_root(directory)
+        self.find_in_files.set_root(directory)
+        self.symbol_indexer.index_project(directory)
+        self.path_index.index_project(directory)
+        self.statusBar().showMessage(f"Indexing symbols in {directory}...")
+
+    def project_symbols_ready(self, words):
+        set_project_words("Python", words)
+
+    def project_words_changed(self, added, removed):
+        update_project_words("Python", added, removed)
 
-            self.file_tree.setRootIndex(self.file_model.index(directory))
+    def project_index_finished(self, file_count, symbol_count, elapsed):
+        self.statusBar().showMessage(f"Indexed {symbol_count} symbols in {file_count} files ({elapsed:.1f} s)")
+
+    def project_index_updated(self, file_count, elapsed):
+        self.statusBar().showMessage(f"Re-indexed {file_count} changed files ({elapsed * 1000:.0f} ms)")
     
     def open_file(self):
         try:
             path, _ = QFileDialog.getOpenFileName(self, "Open File", "", "Python Files (*.py)")
             
             if path:
-                self.load_file(path)
-
-                self.stacked_widget.setCurrentIndex(1)
+                self.open_location(path)
             
         except:
             QMessageBox.critical(self, "Error", f"Could not Open File")
-    def load_file(self, path):
+    def load_file(self, path, line=None, column=0):
+        placeholder = LoadingWidget(path)
+        placeholder.location = (line, column) if line is not None else None
+        self.start_loading(placeholder)
+        placeholder.cancelRequested.connect(lambda: self.close_tab(self.tab_widget.indexOf(placeholder)))
+
+        self.tab_widget.addTab(placeholder, os.path.basename(path))
+        self.tab_widget.setCurrentWidget(placeholder)
+
+    def start_loading(self, placeholder):
+        path = placeholder.path
+        job = FileLoadJob(path)
+        placeholder.job = job
+        started = time.perf_counter()
+
+        job.signals.progress.connect(placeholder.set_progress)
+        job.signals.textLoaded.connect(lambda text: self.file_text_loaded(job, placeholder, text))
+        job.signals.chunkLoaded.connect(lambda chunk: self.file_chunk_loaded(job, placeholder, chunk, started))
+        job.signals.finished.connect(lambda: self.file_load_finished(job, placeholder, started))
+        job.signals.failed.connect(lambda message: self.file_load_failed(job, placeholder, message))
+        self.statusBar().showMessage(f"Loading {path}...")
+
+        QThreadPool.globalInstance().start(job)
+
+    def editor_state(self, widget):
+        if isinstance(widget, LoadingWidget):
+            return widget.session_state or {"path": widget.path}
+        if not isinstance(widget, CodeEditor) or not widget.file_path:
+            return None
+        line, index = widget.getCursorPosition()
+        return {
+            "path": widget.file_path,
+            "line": line,
+            "index": index,
+            "first_line": widget.firstVisibleLine(),
+            "folds": widget.contractedFolds(),
+            "language": widget.language,
+        }
+
+    def apply_editor_state(self, editor, state):
+        language = state.get("language")
+        if language and language != editor.language:
+            editor.set_language(language)
+            if editor is self.current_editor():
+                self.sync_language()
+        editor.setCursorPosition(state.get("line", 0), state.get("index", 0))
+        if state.get("folds") and not editor.large_file:
+            # Fold levels come from styling, which otherwise only covers the visible lines
+            editor.SendScintilla(QsciScintilla.SCI_COLOURISE, 0, -1)
+            editor.setContractedFolds(state["folds"])
+        editor.setFirstVisibleLine(state.get("first_line", 0))
+
+    def save_session(self):
+        self.add_restored_tabs(len(self.restored_tabs))
+        tabs = []
+        current = 0
+        for index in range(self.tab_widget.count()):
+            state = self.editor_state(self.tab_widget.widget(index))
+            if state is None:
+                continue
+            if index == self.tab_widget.currentIndex():
+                current = len(tabs)
+            tabs.append(state)
+        session = {"project": self.project_watcher.root, "tabs": tabs, "current": current}
+        self.settings.setValue("session/state", json.dumps(session))
+
+    def restore_session(self):
         try:
-            with open(path, 'r') as f:
-                content = f.read()
-            
-            editor = CodeEditor()
-            editor.setText(content)
-            
-            
-            directory = os.path.dirname(path)
-            QDir.setCurrent(directory)
+            session = json.loads(self.settings.value("session/state", "", type=str) or "{}")
+        except ValueError:
+            return
+        project = session.get("project")
+        if project and os.path.isdir(project):
+            self.file_tree.setRootIndex(self.file_model.set_root(project))
+            self.set_project_root(project)
 
-            self.file_model.setRootPath(directory)
-            self.file_tree.setRootIndex(self.file_model.index(directory)) 
-            file_extension = os.path.splitext(path)[1].lower()
-            language = self.get_language_for_extension(file_extension)
-            
-            self.tab_widget.addTab(editor, os.path.basename(path))
+        tabs = [tab for tab in session.get("tabs", []) if os.path.isfile(tab.get("path", ""))]
+        if not tabs:
+            return
+        # Only the tab that was current is added and loaded now. The rest start as bare placeholders
+        # and join the tab bar a few at a time once the window is up.
+        current = min(session.get("current", 0), len(tabs) - 1)
+        self.restored_tabs = [(index < current, self.session_placeholder(tab)) for index, tab in enumerate(tabs)
+                              if index != current]
+        placeholder = self.session_placeholder(tabs[current])
+        self.tab_widget.addTab(placeholder, os.path.basename(placeholder.path))
+        self.tab_widget.setCurrentWidget(placeholder)
+        self.tab_activated()
+        self.stacked_widget.setCurrentIndex(1)
+        if self.restored_tabs:
+            QTimer.singleShot(0, self.add_restored_tabs)
+
+    def session_placeholder(self, tab):
+        placeholder = LoadingWidget(tab["path"])
+        placeholder.session_state = tab
+        placeholder.cancelRequested.connect(lambda: self.close_tab(self.tab_widget.indexOf(placeholder)))
+        return placeholder
+
+    def add_restored_tabs(self, count=RESTORE_TABS_PER_TICK):
+        batch, self.restored_tabs = self.restored_tabs[:count], self.restored_tabs[count:]
+        for before_current, placeholder in batch:
+            # Tabs that were ahead of the current one go in front of it, in their saved order
+            if before_current:
+                self.tab_widget.insertTab(self.restored_front, placeholder, os.path.basename(placeholder.path))
+                self.restored_front += 1
+            else:
+                self.tab_widget.addTab(placeholder, os.path.basename(placeholder.path))
+        if self.restored_tabs:
+            QTimer.singleShot(0, self.add_restored_tabs)
+
+    def tab_activated(self, index=None):
+        if self.defer_tab_loading:
+            return
+        widget = self.tab_widget.currentWidget()
+        if isinstance(widget, LoadingWidget) and widget.job is None:
+            self.start_loading(widget)
+        self.sync_language()
+
+    def sync_language(self):
+        editor = self.current_editor()
+        if editor:
+            self.drop_down.blockSignals(True)
+            self.drop_down.setCurrentText(editor.language)
+            self.drop_down.blockSignals(False)
+
+    def find_tab(self, path):
+        path = os.path.abspath(path)
+        # Restored tabs still waiting for the tab bar are added now so they can be matched
+        if any(os.path.abspath(placeholder.path) == path for _, placeholder in self.restored_tabs):
+            self.add_restored_tabs(len(self.restored_tabs))
+        for index in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(index)
+            if isinstance(widget, CodeEditor) and widget.file_path and os.path.abspath(widget.file_path) == path:
+                return widget
+            # A restored tab stays a placeholder until it is first shown
+            if isinstance(widget, LoadingWidget) and os.path.abspath(widget.path) == path:
+                return widget
+        return None
+
+    def open_location(self, path, line=None, column=0):
+        widget = self.find_tab(path)
+        if widget is None:
+            self.load_file(path, line, column)
+        elif isinstance(widget, LoadingWidget):
+            if line is not None:
+                widget.location = (line, column)
+            self.tab_widget.setCurrentWidget(widget)
+        else:
+            self.tab_widget.setCurrentWidget(widget)
+            if line is not None:
+                self.go_to_location(widget, line, column)
+        self.stacked_widget.setCurrentIndex(1)
+
+    def go_to_location(self, editor, line, column):
+        editor.setCursorPosition(line, column)
+        editor.ensureLineVisible(line)
+        editor.setFocus()
+
+    def replace_placeholder(self, placeholder, editor):
+        index = self.tab_widget.indexOf(placeholder)
+        was_current = self.tab_widget.currentIndex() == index
+        # Removing the tab briefly activates a neighbour, which mustn't start loading a restored tab
+        self.defer_tab_loading = True
+        self.tab_widget.removeTab(index)
+        self.tab_widget.insertTab(index, editor, os.path.basename(placeholder.path))
+        self.defer_tab_loading = False
+        placeholder.editor = editor
+        placeholder.deleteLater()
+        if was_current:
             self.tab_widget.setCurrentWidget(editor)
-            
+
+        path = placeholder.path
+        directory = os.path.dirname(path)
+        # The explorer keeps showing the project, only the working directory follows the file
+        if os.path.abspath(directory) != os.path.abspath(QDir.currentPath()):
+            QDir.setCurrent(directory)
+
+        file_extension = os.path.splitext(path)[1].lower()
+        language = self.get_language_for_extension(file_extension)
+        if was_current:
             self.drop_down.setCurrentText(language)
-            self.current_file = path
-            self.unsaved_changes = False
-            
+        self.current_file = path
+        self.unsaved_changes = False
+
+        if self.project_watcher.root is None:
+            self.set_project_root(directory)
+        self.project_watcher.watch_file(path)
+
+    def file_text_loaded(self, job, placeholder, text):
+        if job.cancelled:
+            return
+        editor = CodeEditor()
+        editor.file_path = placeholder.path
+        editor.setText(text)
+        self.replace_placeholder(placeholder, editor)
+        if placeholder.session_state:
+            self.apply_editor_state(editor, placeholder.session_state)
+        if placeholder.location:
+            self.go_to_location(editor, *placeholder.location)
+
+    def file_chunk_loaded(self, job, placeholder, chunk, started):
+        if job.cancelled:
+            return
+        editor = placeholder.editor
+        if editor is None:
+            editor = CodeEditor(large_file=True)
+            editor.file_path = placeholder.path
+            editor.load_job = job
+            editor.append_chunk(chunk)
+            self.replace_placeholder(placeholder, editor)
+            editor.repaint()
+            editor.first_paint_ms = (time.perf_counter() - started) * 1000
+            self.update_large_file_badge()
+            self.statusBar().showMessage(
+                f"Large file mode: first paint in {editor.first_paint_ms:.0f} ms, loading rest...")
+        else:
+            editor.append_chunk(chunk)
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not open file: {e}")
+    def file_load_finished(self, job, placeholder, started):
+        if job.cancelled:
+            return
+        editor = placeholder.editor
+        if editor is None:
+            return
+        elapsed = time.perf_counter() - started
+        if editor.large_file:
+            editor.load_job = None
+            editor.finish_large_file_load()
+            if placeholder.session_state:
+                self.apply_editor_state(editor, placeholder.session_state)
+            if placeholder.location:
+                self.go_to_location(editor, *placeholder.location)
+            self.statusBar().showMessage(
+                f"Loaded {os.path.basename(editor.file_path)}: {editor.lines()} lines, "
+                f"first paint {editor.first_paint_ms:.0f} ms, total {elapsed:.2f} s")
+        else:
+            self.statusBar().showMessage(f"Loaded {editor.file_path} in {elapsed * 1000:.0f} ms")
+
+    def file_load_failed(self, job, placeholder, message):
+        if job.cancelled:
+            return
+        job.cancel()
+        self.tab_widget.removeTab(self.tab_widget.indexOf(placeholder))
+        placeholder.deleteLater()
+        if self.tab_widget.count() == 0:
+            self.stacked_widget.setCurrentIndex(0)
+        QMessageBox.critical(self, "Error", f"Could not open file: {message}")
+
+    def update_large_file_badge(self, index=None):
+        editor = self.current_editor()
+        if editor and editor.large_file:
+            self.large_file_badge.setText("Large file: " + ", ".join(editor.disabled_features) + " off")
+            self.large_file_badge.show()
+        else:
+            self.large_file_badge.hide()
+
+    def current_editor(self):
+        widget = self.tab_widget.currentWidget()
+        if isinstance(widget, CodeEditor):
+            return widget
+        return None
 
     def save_file(self):
-        current_editor = self.tab_widget.currentWidget()
+        current_editor = self.current_editor()
         
         if not current_editor:
             QMessageBox.warning(self, "Error", "No active editor")
@@ -598,6 +960,7 @@ class IDE(QMainWindow):
                 with open(current_tab_text, 'w') as f:
                     f.write(current_editor.text())
                 self.statusBar().showMessage(f"File saved: {current_tab_text}")
+                self.find_in_files.files_changed([os.path.abspath(current_tab_text)])
                 self.unsaved_changes = False
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error saving file: {e}")
@@ -618,6 +981,7 @@ class IDE(QMainWindow):
                     current_editor.file_path = file_path
                     
                     self.statusBar().showMessage(f"File saved: {file_path}")
+                    self.find_in_files.files_changed([os.path.abspath(file_path)])
                     self.unsaved_changes = False
                 except Exception as e:
                     QMessageBox.critical(self, "Error", f"Error saving file: {e}")
@@ -647,12 +1011,24 @@ class IDE(QMainWindow):
             self.file_tree.setMaximumWidth(0)
             
     def change_language_highlighting(self, language):
-        current_editor = self.tab_widget.currentWidget()
+        current_editor = self.current_editor()
         if current_editor:
             current_editor.set_language(language)
             self.statusBar().showMessage(f"Language changed to: {language}")
 
     def close_tab(self, index):
+        widget = self.tab_widget.widget(index)
+        if isinstance(widget, LoadingWidget):
+            if widget.job:
+                widget.job.cancel()
+            self.tab_widget.removeTab(index)
+            widget.deleteLater()
+            if self.tab_widget.count() == 0:
+                self.stacked_widget.setCurrentIndex(0)
+            return
+        if getattr(widget, 'load_job', None):
+            widget.load_job.cancel()
+
         if self.unsaved_changes:
             reply = QMessageBox.question(
                 self, "Unsaved Changes",
@@ -667,19 +1043,187 @@ class IDE(QMainWindow):
                 return
         
         self.tab_widget.removeTab(index)
+        if isinstance(widget, CodeEditor):
+            self.close_session(widget)
+            widget.release_highlighter()
+            widget.deleteLater()
 
         if self.tab_widget.count() == 0:
             self.stacked_widget.setCurrentIndex(0)
     def push_numbered_lines(self):
-        current_editor = self.tab_widget.currentWidget()
+        current_editor = self.current_editor()
         test = current_editor.text()
         current_editor.setText
         print(test)
+    def session_for(self, editor):
+        session = self.sessions.get(editor)
+        if session is None:
+            if editor is None:
+                name = "Terminal"
+            else:
+                name = os.path.basename(editor.file_path) if editor.file_path else "Untitled"
+            session = RunSession(name, self.settings.value("console/max_lines", DEFAULT_MAX_LINES, type=int), self)
+            session.stateChanged.connect(lambda state, session=session: self.session_state_changed(session, state))
+            session.finished.connect(lambda exit_code, session=session: self.session_finished(session))
+            session.pipeline.statsUpdated.connect(
+                lambda lines_per_second, flush_ms, session=session: self.update_output_stats(session, lines_per_second, flush_ms))
+            self.sessions[editor] = session
+            self.console.addWidget(session.console)
+        return session
+
+    def show_current_session(self):
+        session = self.sessions.get(self.current_editor())
+        self.console.setCurrentWidget(session.console if session else self.console_placeholder)
+
+    def close_session(self, editor):
+        session = self.sessions.pop(editor, None)
+        if session:
+            if self.kernel_session is session:
+                self.kernel_session = None
+            self.console.removeWidget(session.console)
+            session.close()
+
+    def session_state_changed(self, session, state):
+        editor = next((key for key, value in self.sessions.items() if value is session), None)
+        index = self.tab_widget.indexOf(editor) if editor is not None else -1
+        if index >= 0:
+            colors = {"running": QColor("#6A9955"), "failed": QColor("#F48771")}
+            self.tab_widget.tabBar().setTabTextColor(index, colors.get(state, QColor()))
+        self.statusBar().showMessage(f"{session.name}: {state}")
+
+    def session_finished(self, session):
+        profile = session.profile
+        if not profile or not os.path.exists(profile["output"]):
+            return
+        try:
+            with open(profile["output"], encoding="utf-8") as f:
+                results = json.load(f)
+        except (OSError, ValueError) as e:
+            session.notice(f"Could not read profile results: {e}\n")
+            return
+        if results["kind"] == "calls":
+            self.show_call_profile(session, results)
+        elif results["kind"] == "lines":
+            self.show_line_profile(session, results)
+        elif results["kind"] == "memory":
+            self.show_memory_profile(session, results)
+
+    def show_call_profile(self, session, results):
+        functions = results["functions"]
+        total = sum(function["self"] for function in functions) or 1.0
+        rows = []
+        for function in functions:
+            location = (function["file"], function["line"]) if function["line"] else None
+            where = f"{os.path.basename(function['file'])}:{function['line']}" if function["line"] else function["file"]
+            rows.append(([function["function"], where, function["calls"], round(function["self"] * 1000, 3),
+                          round(function["self"] / total * 100, 1), round(function["cumulative"] * 1000, 3)], location))
+        columns = ["Function", "Location", "Calls", "Self (ms)", "Self %", "Cumulative (ms)"]
+        self.profile_panel.show_results(f"{session.name}: {len(functions)} functions, {total * 1000:.0f} ms",
+                                        {"Functions": (columns, rows)}, sort_column=5)
+
+        # The hottest functions of every open file get an inline note on their def line
+        notes = {}
+        for function in sorted(functions, key=lambda function: function["self"], reverse=True):
+            file_notes = notes.setdefault(function["file"], [])
+            if len(file_notes) < 5 and function["line"] and function["self"] > 0 and function["function"] != "<module>":
+                file_notes.append((function["line"] - 1,
+                                   f"{function['self'] * 1000:.1f} ms self, {function['cumulative'] * 1000:.1f} ms total, "
+                                   f"{function['calls']} calls ({function['self'] / total * 100:.0f}% of run)"))
+        self.annotate_open_editors(session, notes)
+
+    def show_line_profile(self, session, results):
+        lines = results["lines"]
+        total = sum(ns for _, _, _, ns in lines) or 1
+        elapsed = results["elapsed"] or 1e-9
+        overhead = results["overhead"]
+        sources = {editor.file_path or "<untitled>": editor for editor in self.open_editors()}
+
+        rows = []
+        for filename, line, hits, ns in lines:
+            editor = sources.get(filename)
+            source = editor.text(line - 1) if editor else linecache.getline(filename, line)
+            rows.append(([source.strip(), f"{os.path.basename(filename)}:{line}", hits, round(ns / 1e6, 3),
+                          round(ns / total * 100, 1)], (filename, line)))
+        columns = ["Line", "Location", "Hits", "Time (ms)", "Time %"]
+        self.profile_panel.show_results(
+            f"{session.name}: {len(lines)} lines via {results['backend']}, {elapsed * 1000:.0f} ms run, "
+            f"~{overhead * 1000:.0f} ms ({min(100, overhead / elapsed * 100):.0f}%) instrumentation overhead",
+            {"Lines": (columns, rows)}, sort_column=3)
+
+        # Log scale, otherwise one hot loop leaves every other line in the coldest colour
+        peak = math.log1p(max((ns for _, _, _, ns in lines), default=0)) or 1
+        heat = {}
+        notes = {}
+        for filename, line, hits, ns in sorted(lines, key=lambda entry: entry[3], reverse=True):
+            heat.setdefault(filename, {})[line - 1] = int(math.log1p(ns) / peak * (len(HEATMAP_COLORS) - 1))
+            file_notes = notes.setdefault(filename, [])
+            if len(file_notes) < 5:
+                file_notes.append((line - 1, f"{hits} hits, {ns / 1e6:.1f} ms ({ns / total * 100:.0f}% of traced time)"))
+        self.annotate_open_editors(session, notes, heat)
+
+    def show_memory_profile(self, session, results):
+        sources = {editor.file_path or "<untitled>": editor for editor in self.open_editors()}
+        columns = ["Allocation site", "Location", "Size (KB)", "Size change (KB)", "Blocks", "Block change"]
+
+        def rows(stats):
+            table = []
+            for stat in stats:
+                editor = sources.get(stat["file"])
+                source = editor.text(stat["line"] - 1) if editor else linecache.getline(stat["file"], stat["line"])
+                table.append(([source.strip(), f"{os.path.basename(stat['file'])}:{stat['line']}",
+                               round(stat["size"] / 1024, 1), round(stat["size_diff"] / 1024, 1),
+                               stat["count"], stat["count_diff"]], (stat["file"], stat["line"])))
+            return table
+
+        views = {"Held at exit": (columns, rows(results["top"]))}
+        for diff in results["diffs"]:
+            views[diff["label"]] = (columns, rows(diff["stats"]))
+
+        megabyte = 1024 * 1024
+        peak_rss = f"{results['peak_rss'] / megabyte:.1f} MB" if results["peak_rss"] else "n/a"
+        self.profile_panel.show_results(
+            f"{session.name}: peak RSS {peak_rss}, traced peak {results['traced_peak'] / megabyte:.1f} MB, "
+            f"{len(results['snapshots'])} snapshots", views, sort_column=2)
+
+        notes = {}
+        for stat in results["top"][:10]:
+            notes.setdefault(stat["file"], []).append(
+                (stat["line"] - 1, f"{stat['size'] / 1024:,.1f} KB in {stat['count']:,} blocks held at exit"))
+        for snapshot in results["snapshots"]:
+            if snapshot["location"]:
+                filename, line = snapshot["location"]
+                notes.setdefault(filename, []).append(
+                    (line - 1, f"snapshot: {snapshot['current'] / megabyte:.1f} MB traced before this line"))
+        self.annotate_open_editors(session, notes)
+
+    def open_editors(self):
+        return [self.tab_widget.widget(index) for index in range(self.tab_widget.count())
+                if isinstance(self.tab_widget.widget(index), CodeEditor)]
+
+    def annotate_open_editors(self, session, notes, heat=None):
+        session_editor = next((key for key, value in self.sessions.items() if value is session), None)
+        for editor in self.open_editors():
+            if editor.file_path:
+                key = editor.file_path
+            elif editor is session_editor:
+                key = "<untitled>"
+            else:
+                continue
+            editor.show_annotations(notes.get(key, []))
+            if heat is not None:
+                editor.show_heatmap(heat.get(key, {}))
+            else:
+                editor.clear_heatmap()
+
     def push_console(self):
-        if self.process and self.process.state() == QProcess.ProcessState.Running:
-            input_text = self.userConsole.text() + "\n"
-            self.process.write(input_text.encode("utf-8"))
-            self.console.insertPlainText(input_text)
+        session = self.sessions.get(self.current_editor())
+        if os.name == "posix" and not (session and session.is_running()):
+            self.push_shell()
+            return
+
+        session = self.session_for(self.current_editor())
+        self.console.setCurrentWidget(session.console)
+        if session.write_input(self.userConsole.text() + "\n"):
             self.userConsole.clear()
             self.push_numbered_lines()
         else:
@@ -687,69 +1231,86 @@ class IDE(QMainWindow):
                 command = self.userConsole.text().strip()
                 self.userConsole.clear()
                 if not command:
-                    self.console.append("Error: No command entered")
-
-                if self.process:
-                    self.process.kill()
-                    self.process = None
-                        
-                self.process = QProcess()
-                self.process.setProgram("cmd")
-                self.process.setArguments(["/c", command])
-
-                self.process.readyReadStandardOutput.connect(self.handle_stdout)
-                self.process.readyReadStandardError.connect(self.handle_stderr)
-                self.process.finished.connect(self.process_finished)
-                    
-                self.process.start()
+                    session.console.write("Error: No command entered\n")
+                    return
 
-                self.console.append(f"Running: {command}\n")
-                self.console.append("-" * 50 + "\n")
+                session.run("cmd", ["/c", command], command, "shell")
             except:
                 QMessageBox.warning(self, "Error", "No running process to send input.")
-        
+
+    def eventFilter(self, obj, event):
+        # Ctrl+C in the terminal line interrupts the shell's foreground job, unless there is a selection to copy
+        if (obj is self.userConsole and event.type() == QEvent.Type.KeyPress
+                and event.matches(QKeySequence.StandardKey.Copy) and not self.userConsole.hasSelectedText()):
+            session = self.sessions.get(None)
+            if session and session.interrupt():
+                return True
+        return super().eventFilter(obj, event)
+
+    def push_shell(self):
+        # One long-lived shell on a pseudo-terminal, so cd, exports and background jobs carry over
+        session = self.session_for(None)
+        self.console.setCurrentWidget(session.console)
+        command = self.userConsole.text()
+        self.userConsole.clear()
+        if session.write_input(command + "\n"):
+            return
+        shell = PtyShell(session)
+        try:
+            shell.start(self.project_watcher.root or os.getcwd())
+        except OSError as e:
+            session.console.write(f"Error: could not start shell: {e}\n", "stderr")
+            return
+        session.attach_shell(shell, os.environ.get("SHELL", "/bin/sh"))
+        session.write_input(command + "\n")
+
     def run_code(self):
-        self.console.clear()
-        
-        current_editor = self.tab_widget.currentWidget()
+        self.start_run()
+
+    def profile_code(self):
+        self.start_run("calls")
+
+    def line_profile_code(self):
+        self.start_run("lines")
+
+    def memory_profile_code(self):
+        self.start_run("memory")
+
+    def start_run(self, profile_kind=None):
+        current_editor = self.current_editor()
         if not current_editor:
             QMessageBox.warning(self, "Error", "No active editor")
             return
         
         code = current_editor.text()
-        
-        temp_file = "temp_script.py"
-        try:
-            with open(temp_file, "w") as f:
-                f.write(code)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to create temp file: {e}")
-            return
-        
-        if self.process:
-            self.process.kill()
-            self.process = None
-            
-        self.process = QProcess()
-        self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
-        self.process.readyReadStandardOutput.connect(self.handle_stdout)
-        self.process.readyReadStandardError.connect(self.handle_stderr)
-        self.process.finished.connect(self.process_finished)
-        
-        self.process.start(sys.executable, ["-u", temp_file])
-        
-        self.console.append(f"Running: python -u {temp_file}\n")
-        self.console.append("-" * 50 + "\n")
-
-    def handle_stdout(self):
-        if self.process:
-            data = self.process.readAllStandardOutput().data().decode()
-            self.append_output(data)
-
-    def handle_stderr(self):
-        if self.process:
-            data = self.process.readAllStandardError().data().decode()
-            self.append_output(f'<span style="color:red">{data}</span>')
+        session = self.session_for(current_editor)
+        self.console.setCurrentWidget(session.console)
+
+        # The buffer goes to the interpreter over stdin, nothing is written next to the user's files
+        process = self.runner_pool.take() if self.warm_runner_check.isChecked() else None
+        filename = current_editor.file_path or "<untitled>"
+        if process:
+            session.attach(process, f"{filename} (warm runner)")
+        else:
+            process = session.run(sys.executable, bootstrap_arguments(), f"python {filename}")
+
+        session.profile = None
+        if profile_kind:
+            session.profile = {"kind": profile_kind, "output": os.path.join(cache_dir("profiles"), f"{profile_kind}-{os.getpid()}-{id(session)}.json")}
+            if os.path.exists(session.profile["output"]):
+                os.remove(session.profile["output"])
+            if profile_kind == "lines":
+                # Only files open in tabs are traced, everything else runs at full speed
+                session.profile["files"] = [filename] + [editor.file_path for editor in self.open_editors() if editor.file_path]
+            elif profile_kind == "memory":
+                # Breakpoint markers in the margin double as snapshot points
+                markers = {editor.file_path: editor.marked_lines() for editor in self.open_editors() if editor.file_path}
+                markers[filename] = current_editor.marked_lines()
+                session.profile["markers"] = {path: [line + 1 for line in lines] for path, lines in markers.items() if lines}
+            session.notice(f"[profiling: {profile_kind}]\n")
+
+        cwd = os.path.dirname(current_editor.file_path) if current_editor.file_path else os.getcwd()
+        send_source(process, code, filename, cwd, session.profile)
     
     
     def setup_find_shortcut(self):
@@ -758,241 +1319,124 @@ class IDE(QMainWindow):
         find_shortcut.triggered.connect(self.show_find_dialog)
         self.addAction(find_shortcut)
 
+        find_in_files_shortcut = QAction(self)
+        find_in_files_shortcut.setShortcut(QKeySequence("Ctrl+Shift+F"))
+        find_in_files_shortcut.triggered.connect(self.show_find_in_files)
+        self.addAction(find_in_files_shortcut)
+
+        quick_open_shortcut = QAction(self)
+        quick_open_shortcut.setShortcut(QKeySequence("Ctrl+P"))
+        quick_open_shortcut.triggered.connect(self.show_quick_open)
+        self.addAction(quick_open_shortcut)
+
+    def setup_cell_shortcuts(self):
+        shortcuts = [
+            ("Ctrl+Return", self.run_cell),
+            ("Shift+Return", lambda: self.run_cell(advance=True)),
+            ("Ctrl+Alt+Return", self.run_cells_above),
+            ("Ctrl+Shift+C", self.kernel.interrupt),
+            ("Ctrl+Shift+K", self.restart_kernel),
+        ]
+        for keys, handler in shortcuts:
+            action = QAction(self)
+            action.setShortcut(QKeySequence(keys))
+            action.setShortcutContext(Qt.ShortcutContext.WindowShortcut)
+            action.triggered.connect(handler)
+            self.addAction(action)
+
+    def execute_lines(self, editor, first, last):
+        code = editor.lines_text(first, last)
+        filename = editor.file_path or "<untitled>"
+        cwd = os.path.dirname(editor.file_path) if editor.file_path else None
+        self.kernel_session = self.session_for(editor)
+        self.console.setCurrentWidget(self.kernel_session.console)
+        self.kernel_session.notice(f"\n[{os.path.basename(filename)}:{first + 1}-{last + 1}]\n")
+        self.kernel.execute(code, filename, first, editor.text(), cwd)
+
+    def run_cell(self, advance=False):
+        current_editor = self.current_editor()
+        if not current_editor or current_editor.language != "Python":
+            return
+        line, _ = current_editor.getCursorPosition()
+        first, last = current_editor.cell_at(line)
+        self.execute_lines(current_editor, first, last)
+        if advance and last + 1 < current_editor.lines():
+            current_editor.setCursorPosition(last + 1, 0)
+            current_editor.ensureLineVisible(last + 1)
+
+    def run_cells_above(self):
+        current_editor = self.current_editor()
+        if not current_editor or current_editor.language != "Python":
+            return
+        line, _ = current_editor.getCursorPosition()
+        first, _ = current_editor.cell_at(line)
+        if first > 0:
+            self.execute_lines(current_editor, 0, first - 1)
+
+    def restart_kernel(self):
+        self.kernel.restart()
+        if self.kernel_session:
+            self.kernel_session.notice("\n[kernel restarted]\n")
+
+    def kernel_output(self, channel, text):
+        # Cells stream into the console of the tab that ran them last
+        session = self.kernel_session or self.session_for(self.current_editor())
+        session.pipeline.feed(text, channel)
+
+    def kernel_state_changed(self, state):
+        if state in ("starting", "dead"):
+            self.statusBar().showMessage(f"Kernel {state}")
+
+    def cell_finished(self, cell_id, ok, elapsed):
+        self.statusBar().showMessage(f"Cell {'finished' if ok else 'failed'} in {elapsed * 1000:.0f} ms")
+
+    def show_find_in_files(self):
+        selected = ""
+        current_editor = self.current_editor()
+        if current_editor and current_editor.hasSelectedText():
+            selected = current_editor.selectedText()
+        self.find_in_files.show()
+        self.find_in_files.focus_query(selected)
+
     def show_find_dialog(self):
-        current_editor = self.tab_widget.currentWidget()
+        current_editor = self.current_editor()
         if not current_editor:
             QMessageBox.warning(self, "Error", "No active editor")
             return
 
-        find_dialog = QDialog(self)
-        find_dialog.setWindowTitle("Find")
-        find_dialog.setModal(False)
-
-        layout = QVBoxLayout(find_dialog)
-
-        find_input = QLineEdit()
-        find_input.setPlaceholderText("Enter text to find")
-        layout.addWidget(find_input)
-
-        options_layout = QHBoxLayout()
-        case_sensitive = QCheckBox("Case Sensitive")
-        whole_word = QCheckBox("Whole Word")
-        options_layout.addWidget(case_sensitive)
-        options_layout.addWidget(whole_word)
-        layout.addLayout(options_layout)
-
-        button_layout = QHBoxLayout()
-        find_next_btn = QPushButton("Find Next")
-        find_prev_btn = QPushButton("Find Previous")
-        button_layout.addWidget(find_next_btn)
-        button_layout.addWidget(find_prev_btn)
-        layout.addLayout(button_layout)
-
-        def find_text(forward=True):
-            text_to_find = find_input.text()
-            if not text_to_find:
-                return
-
-            cs = case_sensitive.isChecked()  
-            ww = whole_word.isChecked()      
-            wrap = True                      
-            regexp = False                   
-            forward_search = forward        
-
-            line, pos = current_editor.getCursorPosition()
-
-            found = current_editor.findFirst(text_to_find, 
-                                             regexp,
-                                               cs, ww,
-                                                 wrap,
-                                                   forward_search,
-                                                     line,
-                                                       pos
-                                                        )
-
-            if not found:
-                pass
-            else:
-                pass
-
-        def find_next():
-            text_to_find = find_input.text()
-            if not text_to_find:
-                return
-
-            found = current_editor.findNext()
-            if not found:
-                line, pos = 0, 0 
-                found = current_editor.findFirst(
-                    text_to_find,
-                     False, # regex
-                      case_sensitive.isChecked(),
-                       whole_word.isChecked(),
-                        True, # wrap
-                         True, # backward
-                          line,
-                           pos
-                            )
-                
-                if not found:
-                    QMessageBox.information(find_dialog, "Find", "Text not found")
-
-        def find_previous():
-            text_to_find = find_input.text()
-            if not text_to_find:
-                return
-
-            line_from, pos_from, line_to, pos_to = current_editor.getSelection()
-
-            if line_from != -1:
-                current_editor.setCursorPosition(line_from, pos_from)
-
-            found = current_editor.findFirst(
-                text_to_find,
-                 False, # regex
-                  case_sensitive.isChecked(),
-                   whole_word.isChecked(),
-                    True, # wrap
-                     False, # backward
-                      line_from if line_from != -1 else 0,
-                       pos_from if pos_from != -1 else 0
-                        )
-
-            if not found:
-                line_count = current_editor.lines()
-                last_line = current_editor.text(line_count - 1)
-                last_pos = len(last_line)
-                found = current_editor.findFirst(
-                    text_to_find,
-                    False,  # regex
-                    case_sensitive.isChecked(),
-                    whole_word.isChecked(),
-                    True,   # wrap
-                    False,  # backward
-                    line_count - 1,
-                    last_pos
-                )
-                if not found:
-                    QMessageBox.information(find_dialog, "Find", "Text not found")
-
-        find_next_btn.clicked.connect(find_next)
-        find_prev_btn.clicked.connect(find_previous)
-
-        # Update the search whenever the options change
-        def update_search():
-            # Re-run the search with the new options
-            find_text(forward=True)
-
-        case_sensitive.stateChanged.connect(update_search)
-        whole_word.stateChanged.connect(update_search)
-        find_input.textChanged.connect(lambda: find_text(forward=True))
-
-        find_dialog.setStyleSheet("""
-            QDialog {
-                background-color: #2d2d2d;
-                color: #d4d4d4;
-                border-radius: 6px;
-            }
-
-            QLabel {
-                color: #b0b0b0;
-                font-weight: 500;
-            }
-
-            QLineEdit {
-                background-color: #3d3d3d;
-                color: #d4d4d4;
-                border: 1px solid #4d4d4d;
-                border-radius: 4px;
-                padding: 6px 8px;
-                selection-background-color: #264f78;
-                min-height: 28px;
-            }
-
-            QLineEdit:focus {
-                border: 1px solid #569cd6;
-                outline: none;
-            }
-
-            QCheckBox {
-                background-color: transparent;
-                color: #d4d4d4;
-                spacing: 6px;
-            }
-
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                border-radius: 4px;
-                border: 1px solid #4d4d4d;
-                background-color: #3d3d3d;
-            }
-
-            QCheckBox::indicator:checked {
-                background-color: #569cd6;
-                border: 1px solid #569cd6;
-            }
-
-            QPushButton {
-                background-color: #3d3d3d;
-                color: #d4d4d4;
-                border: 1px solid #4d4d4d;
-                border-radius: 4px;
-                padding: 6px 12px;
-                min-width: 80px;
-                font-weight: 600;
-            }
-
-            QPushButton:hover {
-                background-color: #4d4d4d;
-                border-color: #569cd6;
-            }
-
-            QPushButton:pressed {
-                background-color: #505050;
-            }
-
-            QPushButton:default {
-                border: 2px solid #569cd6;
-            }
-        """)
-
-        find_dialog.show()
-    def process_finished(self, exit_code):
-        self.append_output("\n" + "-" * 50 + "\n")
-        if exit_code == 0:
-            self.append_output(f"Process finished successfully (exit code: {exit_code})")
-        else:
-            self.append_output(f"Process failed (exit code: {exit_code})")
-        
-        try:
-            if os.path.exists("temp_script.py"):
-                os.remove("temp_script.py")
-        except Exception as e:
-            pass
-    def append_output(self, text):
-        cursor = self.console.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        
-        clean_text = text.replace('</span>', '').replace('<span style="color:red">', '')
-    
-        cursor.insertText(clean_text)
-        self.console.ensureCursorVisible()
-
-
-        self.console.ensureCursorVisible()
+        if self.find_dialog is None:
+            self.find_dialog = FindDialog(self)
+        self.find_dialog.set_editor(current_editor)
+        self.find_dialog.show()
+        self.find_dialog.raise_()
+    def show_quick_open(self):
+        if self.path_index.root is None:
+            self.path_index.index_project(self.project_watcher.root or self.file_model.root or os.getcwd())
+        if self.quick_open is None:
+            self.quick_open = QuickOpenDialog(self.path_index, self)
+            self.quick_open.fileSelected.connect(self.open_quick_open_file)
+        self.quick_open.popup()
+
+    def open_quick_open_file(self, path):
+        self.open_location(path)
+
+    def update_output_stats(self, session, lines_per_second, flush_ms):
+        if not session.pipeline.timer.isActive() and lines_per_second == 0:
+            self.output_stats_label.hide()
+            return
+        self.output_stats_label.setText(f"{session.name}: {lines_per_second:,.0f} lines/s, flush {flush_ms:.1f} ms")
+        self.output_stats_label.show()
     def open_file_from_tree(self, index):
-        path = self.file_model.filePath(index)
+        path = self.file_model.file_path(index)
         if os.path.isfile(path):
-            self.load_file(path)
-            self.stacked_widget.setCurrentIndex(1)
+            self.open_location(path)
 
     def undo(self):
-        current_editor = self.tab_widget.currentWidget()
+        current_editor = self.current_editor()
         if current_editor:
             current_editor.undo()
 
     def redo(self):
-        current_editor = self.tab_widget.currentWidget()
+        current_editor = self.current_editor()
         if current_editor:
             current_editor.redo()
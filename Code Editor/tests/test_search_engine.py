@@ -0,0 +1,48 @@
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+from PyQt6.Qsci import QsciScintilla
+from components.search_engine import SearchEngine
+
+app = QApplication.instance() or QApplication([])
+
+
+def wait_for_count(engine):
+    loop = QEventLoop()
+    engine.matchesReady.connect(loop.quit)
+    QTimer.singleShot(2000, loop.quit)
+    if engine.count() is None:
+        loop.exec()
+    engine.matchesReady.disconnect(loop.quit)
+    return engine.count(), list(engine.starts)
+
+
+def typed_count(text, queries, whole_word=False):
+    editor = QsciScintilla()
+    editor.setText(text)
+    engine = SearchEngine(editor)
+    for query in queries:
+        engine.set_query(query, whole_word=whole_word)
+        result = wait_for_count(engine)
+    return result
+
+
+@pytest.mark.parametrize("text, queries, expected", [
+    ("aaab", ["aa", "aab"], (1, [1])),
+    ("aaa", ["a", "aa"], (1, [0])),
+    ("ababab", ["ab", "abab"], (1, [0])),
+    ("foo bar foobar", ["foo", "foob"], (1, [8])),
+])
+def test_extending_a_query_matches_a_fresh_search(text, queries, expected):
+    assert typed_count(text, queries) == expected
+    assert typed_count(text, queries[-1:]) == expected
+
+
+def test_whole_word_extension_recounts():
+    assert typed_count("foobar foo foob foob", ["foo", "foob"], whole_word=True) == (2, [11, 16])
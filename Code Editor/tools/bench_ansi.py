@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+
+# Compares console throughput on plain and colourised output of the same text.
+# Run from anywhere: python tools/bench_ansi.py [lines]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+from components.ansi_parser import AnsiParser
+from components.console_view import ConsoleView
+
+CHUNK_CHARS = 64 * 1024
+
+
+def colored_lines(count):
+    lines = []
+    for number in range(count):
+        if number % 10 == 0:
+            lines.append(f"\x1b[1m\x1b[31mFAILED\x1b[0m tests/test_module.py::test_case_{number} - \x1b[31mAssertionError\x1b[0m\n")
+        elif number % 3 == 0:
+            lines.append(f"\x1b[2m2024-01-01 12:00:00\x1b[22m \x1b[33mWARNING\x1b[39m worker {number} is slow to respond\n")
+        else:
+            lines.append(f"\x1b[32mPASSED\x1b[0m tests/test_module.py::test_case_{number} \x1b[38;5;244m[{number % 100}%]\x1b[0m\n")
+    return "".join(lines)
+
+
+def chunks(text):
+    return [text[start:start + CHUNK_CHARS] for start in range(0, len(text), CHUNK_CHARS)]
+
+
+def time_parser(text):
+    parser = AnsiParser()
+    started = time.perf_counter()
+    for chunk in chunks(text):
+        parser.feed(chunk)
+    return time.perf_counter() - started
+
+
+def time_console(app, text):
+    console = ConsoleView(max_lines=10000)
+    started = time.perf_counter()
+    for chunk in chunks(text):
+        console.write_segments([("stdout", chunk)])
+    app.processEvents()
+    elapsed = time.perf_counter() - started
+    console.deleteLater()
+    return elapsed
+
+
+def main():
+    app = QApplication(sys.argv[:1])
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    colored = colored_lines(count)
+    plain = "".join(run for _, run in AnsiParser().feed(colored))
+    print(f"{count} lines, {len(plain) / 1e6:.1f} MB plain, {len(colored) / 1e6:.1f} MB with escapes")
+
+    parse_time = time_parser(colored)
+    print(f"parser:         {count / parse_time:12,.0f} lines/s")
+
+    results = {}
+    for name, text in (("plain", plain), ("colour", colored)):
+        results[name] = time_console(app, text)
+        print(f"console {name:7s}{count / results[name]:12,.0f} lines/s")
+    print(f"colour / plain: {results['colour'] / results['plain']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
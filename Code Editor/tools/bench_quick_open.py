@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import statistics
+
+# Times quick-open searches over a synthetic project index.
+# Run from anywhere: python tools/bench_quick_open.py [paths]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from components.path_index import PathIndex
+
+WORDS = ("src lib core utils test tests components widgets models views api server client data io net "
+         "http json parser lexer compiler runtime docs examples").split()
+# Realistic typing plus queries made of common characters in an unlikely order, which are the slow case
+QUERIES = ["p", "pa", "par", "pars", "parser", "comppar", "srccorepy", "widgetsmodels12", "tests/api", "zzq",
+           "ppppp", "txetsrc", "nosjp", "yxp", "eeeee", "sjtse", "ipa/stset", "99", "lexer_json", "mdtxt"]
+RUNS = 5
+
+
+def synthetic_entries(count):
+    random.seed(1)
+    entries = []
+    for number in range(count):
+        directory = os.path.join(*(random.choice(WORDS) for _ in range(random.randint(1, 5))))
+        extension = random.choice(["py", "js", "md", "txt"])
+        entries.append((directory, f"{random.choice(WORDS)}_{random.choice(WORDS)}{number % 997}.{extension}"))
+    return entries
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    entries = synthetic_entries(count)
+    started = time.perf_counter()
+    index = PathIndex()
+    index.root = tempfile.mkdtemp()
+    index.set_entries(entries)
+    print(f"{count} paths indexed in {time.perf_counter() - started:.2f}s")
+
+    # Every query's worst run counts, the best of a few runs hides the cost of a cold keystroke
+    worst_runs = []
+    for query in QUERIES:
+        timings = []
+        for _ in range(RUNS):
+            started = time.perf_counter()
+            results = index.search(query)
+            timings.append((time.perf_counter() - started) * 1000)
+        worst_runs.append(max(timings))
+        top = results[0] if results else "-"
+        print(f"{query:16s}{len(results):4d} results  median {statistics.median(timings):7.2f} ms"
+              f"  worst {max(timings):7.2f} ms   {top}")
+    print(f"median query: {statistics.median(worst_runs):.2f} ms, slowest query: {max(worst_runs):.2f} ms")
+
+    # A save burst: a few new files on disk and a few synthetic ones that no longer exist
+    added = [os.path.join(index.root, f"new_file{number}.py") for number in range(10)]
+    for path in added:
+        open(path, "w").close()
+    gone = [os.path.join(index.root, *entry) for entry in random.sample(entries, 10)]
+    started = time.perf_counter()
+    index._update(index.root, index._generation, added + gone)
+    print(f"update of {len(added) + len(gone)} paths: {(time.perf_counter() - started) * 1000:.2f} ms, "
+          f"{index.file_count()} files")
+    for path in added:
+        os.remove(path)
+    os.rmdir(index.root)
+
+
+if __name__ == "__main__":
+    main()